@@ -1,16 +1,55 @@
 import streamlit as st
 import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
-from io import BytesIO
-import zipfile
+import numpy as np
+import multiprocessing
 import os
+import shutil
+import sys
 from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import shared_memory
 
-from resume_processor import ResumeProcessor
+from resume_processor import (
+    ResumeProcessor, content_key, extract_resume_shared, get_cached_extraction, release_shared_memory,
+    reserve_shared_memory, show_messages, store_extraction
+)
+from nlp_extractor import SPACY_BATCH_SIZE, SPACY_MODEL_MISSING, get_spacy_model
 from scoring_engine import ScoringEngine
+from scoring_fast import count_skill_matches
 from utils import export_to_csv, create_sample_job_requirements
 
+# Worker processes used to parse uploaded resumes in parallel
+MAX_WORKERS = min(os.cpu_count() or 1, 4)
+# Upper bound on files queued or being parsed at once, so large uploads don't balloon memory
+MAX_IN_FLIGHT = 32
+# Upper bound on upload bytes copied into shared memory for the workers at once, across
+# every session; files that don't fit are pickled to the workers instead
+SHARED_MEMORY_BUDGET = 32 * 1024 * 1024
+
+# Sidebar options
+SUGGESTED_SKILLS = (
+    "Python", "JavaScript", "SQL", "Git", "Machine Learning", "React", "Django",
+    "AWS", "Docker", "Communication", "Problem Solving"
+)
+DEFAULT_SKILLS = ("Python", "Machine Learning", "SQL", "Git", "Communication")
+EDUCATION_LEVELS = ("High School", "Bachelor's Degree", "Master's Degree", "PhD")
+
+# Shared styling for the analytics charts
+CHART_LAYOUT = dict(
+    plot_bgcolor='white',
+    paper_bgcolor='white',
+    font=dict(color='#212529'),
+    title_font_size=16
+)
+
+# Score ranges reported in the analytics insights, lowest first
+SCORE_RANGE_EDGES = [-np.inf, 55, 70, 85, np.inf]
+SCORE_RANGE_LABELS = ['Poor (0-54)', 'Fair (55-69)', 'Good (70-84)', 'Excellent (85-100)']
+
+# Light theme stylesheet, resolved relative to this script
+THEME_CSS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static', 'theme.css')
+
 # Configure page with modern styling
 st.set_page_config(
     page_title="AI Resume Screening System",
@@ -19,173 +58,30 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+@st.cache_resource
+def _load_theme_css():
+    """Read the theme stylesheet once per server process"""
+    with open(THEME_CSS_PATH, encoding='utf-8') as f:
+        return f.read()
+
 # Custom CSS for clean light theme
-st.markdown("""
-<style>
-    .main > div {
-        padding-top: 1rem;
-    }
-    
-    .stApp {
-        background: #f8f9fa;
-    }
-    
-    .main .block-container {
-        background: white;
-        border-radius: 10px;
-        padding: 2rem;
-        margin: 1rem;
-        box-shadow: 0 2px 10px rgba(0,0,0,0.05);
-        border: 1px solid #e9ecef;
-    }
-    
-    .stTabs [data-baseweb="tab-list"] {
-        gap: 2px;
-        background: #f8f9fa;
-        padding: 0.5rem;
-        border-radius: 10px;
-    }
-    
-    .stTabs [data-baseweb="tab"] {
-        background: white;
-        color: #495057;
-        border-radius: 8px;
-        padding: 0.75rem 1.5rem;
-        border: 1px solid #dee2e6;
-        font-weight: 500;
-        transition: all 0.3s ease;
-    }
-    
-    .stTabs [aria-selected="true"] {
-        background: #007bff !important;
-        color: white !important;
-        border-color: #007bff !important;
-        box-shadow: 0 2px 8px rgba(0,123,255,0.3);
-    }
-    
-    .metric-card {
-        background: #007bff;
-        padding: 1.5rem;
-        border-radius: 10px;
-        color: white;
-        text-align: center;
-        margin: 0.5rem 0;
-        box-shadow: 0 2px 8px rgba(0,123,255,0.2);
-    }
-    
-    .success-card {
-        background: #28a745;
-        padding: 1rem;
-        border-radius: 8px;
-        color: white;
-        margin: 0.5rem 0;
-        box-shadow: 0 2px 8px rgba(40,167,69,0.2);
-    }
-    
-    .warning-card {
-        background: #ffc107;
-        padding: 1rem;
-        border-radius: 8px;
-        color: #212529;
-        margin: 0.5rem 0;
-        box-shadow: 0 2px 8px rgba(255,193,7,0.2);
-    }
-    
-    .info-card {
-        background: #17a2b8;
-        padding: 1rem;
-        border-radius: 8px;
-        color: white;
-        margin: 0.5rem 0;
-        box-shadow: 0 2px 8px rgba(23,162,184,0.2);
-    }
-    
-    .stSidebar > div {
-        background: white;
-        border-right: 1px solid #dee2e6;
-    }
-    
-    .stButton > button {
-        background: #007bff;
-        color: white;
-        border: none;
-        padding: 0.5rem 2rem;
-        border-radius: 8px;
-        font-weight: 500;
-        transition: all 0.3s ease;
-        box-shadow: 0 2px 4px rgba(0,123,255,0.2);
-    }
-    
-    .stButton > button:hover {
-        background: #0056b3;
-        transform: translateY(-1px);
-        box-shadow: 0 4px 8px rgba(0,123,255,0.3);
-    }
-    
-    .header-style {
-        color: #212529;
-        font-size: 2.5rem;
-        font-weight: 700;
-        text-align: center;
-        margin-bottom: 1rem;
-    }
-    
-    .sub-header {
-        color: #6c757d;
-        text-align: center;
-        font-size: 1.1rem;
-        margin-bottom: 2rem;
-    }
-    
-    .stSelectbox > div > div {
-        background: white;
-        border: 1px solid #ced4da;
-        border-radius: 6px;
-    }
-    
-    .stTextInput > div > div > input {
-        background: white;
-        border: 1px solid #ced4da;
-        border-radius: 6px;
-    }
-    
-    .stTextArea > div > div > textarea {
-        background: white;
-        border: 1px solid #ced4da;
-        border-radius: 6px;
-    }
-    
-    .stFileUploader > div {
-        border: 2px dashed #ced4da;
-        border-radius: 8px;
-        background: #f8f9fa;
-        padding: 2rem;
-        text-align: center;
-    }
-    
-    .stDataFrame {
-        border: 1px solid #dee2e6;
-        border-radius: 8px;
-        overflow: hidden;
-    }
-    
-    h1, h2, h3, h4 {
-        color: #212529;
-    }
-    
-    .element-container {
-        color: #495057;
-    }
-</style>
-""", unsafe_allow_html=True)
+st.markdown(f"<style>{_load_theme_css()}</style>", unsafe_allow_html=True)
 
 # Initialize session state
 if 'processed_resumes' not in st.session_state:
     st.session_state.processed_resumes = []
+if 'resumes_by_filename' not in st.session_state:
+    st.session_state.resumes_by_filename = {}
+if 'candidate_names' not in st.session_state:
+    st.session_state.candidate_names = ()
+if 'seen_hashes' not in st.session_state:
+    st.session_state.seen_hashes = {}
 if 'job_requirements' not in st.session_state:
     st.session_state.job_requirements = create_sample_job_requirements()
 if 'scoring_engine' not in st.session_state:
     st.session_state.scoring_engine = ScoringEngine()
+if 'resume_processor' not in st.session_state:
+    st.session_state.resume_processor = ResumeProcessor()
 
 def main():
     # Clean header
@@ -202,11 +98,10 @@ def main():
         
         # Skills with suggestions
         st.markdown("**Required Skills**")
-        suggested_skills = ["Python", "JavaScript", "SQL", "Git", "Machine Learning", "React", "Django", "AWS", "Docker", "Communication", "Problem Solving"]
         selected_skills = st.multiselect(
             "Select from common skills or add custom ones:",
-            suggested_skills,
-            default=["Python", "Machine Learning", "SQL", "Git", "Communication"]
+            SUGGESTED_SKILLS,
+            default=DEFAULT_SKILLS
         )
         
         custom_skills = st.text_input("Additional custom skills (comma-separated)", "")
@@ -216,7 +111,7 @@ def main():
         experience_years = st.number_input("Minimum Years of Experience", min_value=0, max_value=20, value=2)
         education_level = st.selectbox(
             "Minimum Education Level",
-            ["High School", "Bachelor's Degree", "Master's Degree", "PhD"]
+            EDUCATION_LEVELS
         )
         
         # Update job requirements
@@ -227,15 +122,18 @@ def main():
                 'experience_years': experience_years,
                 'education_level': education_level
             }
+            # Results kept for duplicate uploads were scored against the old requirements
+            st.session_state.seen_hashes = {}
             st.success("✅ Job requirements updated!")
             
         # Quick stats
         if st.session_state.processed_resumes:
             st.markdown("---")
             st.markdown("#### 📊 Quick Stats")
-            total_resumes = len(st.session_state.processed_resumes)
-            avg_score = sum(r['total_score'] for r in st.session_state.processed_resumes) / total_resumes
-            qualified = len([r for r in st.session_state.processed_resumes if r['total_score'] >= 70])
+            scores = _score_array()
+            total_resumes = len(scores)
+            avg_score = scores.mean()
+            qualified = int((scores >= 70).sum())
             
             col1, col2, col3 = st.columns(3)
             with col1:
@@ -329,22 +227,75 @@ def upload_resumes_tab():
                 st.write(f"• ... and {len(job_req['required_skills']) - 5} more")
 
 def process_uploaded_resumes(uploaded_files):
-    processor = ResumeProcessor()
     progress_bar = st.progress(0)
     status_text = st.empty()
     
-    processed_count = 0
     total_files = len(uploaded_files)
     
-    for i, uploaded_file in enumerate(uploaded_files):
+    # Files already scored in this session are reused outright; the rest
+    # reuse cached extraction results where possible
+    seen_hashes = st.session_state.seen_hashes
+    cache_keys = [content_key(uploaded_file) for uploaded_file in uploaded_files]
+    extracted_results = [None] * total_files
+    first_index = {}
+    uncached = []
+    for i, key in enumerate(cache_keys):
+        if key in seen_hashes or key in first_index:
+            continue
+        first_index[key] = i
+        extracted_results[i] = get_cached_extraction(key)
+        if extracted_results[i] is None:
+            uncached.append(i)
+    
+    # Workers only log a missing model, so tell the user from here
+    if uncached and get_spacy_model() is None:
+        st.error(SPACY_MODEL_MISSING)
+    
+    if len(uncached) > 1 and sys.platform == 'win32':
+        # Process start-up is expensive on Windows, and the PDF parsers
+        # release the GIL for most of their work, so threads scale well enough
+        status_text.text(f"Processing {len(uncached)} resumes in parallel...")
+        batch = st.session_state.resume_processor.process_resumes_parallel(
+            [uploaded_files[i] for i in uncached],
+            max_workers=min(8, (os.cpu_count() or 1) * 2),
+            max_in_flight=MAX_IN_FLIGHT,
+            on_progress=lambda done, total: progress_bar.progress(done / total)
+        )
+        for i, extracted_data in zip(uncached, batch):
+            extracted_results[i] = extracted_data
+    elif len(uncached) > 1 and MAX_WORKERS > 1:
+        status_text.text(f"Processing {len(uncached)} resumes in parallel...")
+        _extract_in_pool(uploaded_files, uncached, extracted_results, progress_bar)
+    else:
+        # A single file isn't worth handing to a worker, and with one CPU there are
+        # no workers to hand files to; parse in this process one file at a time
+        for n, i in enumerate(uncached):
+            status_text.text(f"Processing {uploaded_files[i].name}...")
+            extracted_results[i] = st.session_state.resume_processor.process_resumes([uploaded_files[i]])[0]
+            progress_bar.progress((n + 1) / len(uncached))
+    
+    for i in uncached:
+        if extracted_results[i]:
+            store_extraction(cache_keys[i], extracted_results[i])
+    progress_bar.progress(1.0)
+    
+    # Score in this process so the session's scoring engine stays authoritative
+    new_resumes = []
+    for uploaded_file, key in zip(uploaded_files, cache_keys):
         try:
-            status_text.text(f"Processing {uploaded_file.name}...")
-            
-            # Process the resume
-            extracted_data = processor.process_resume(uploaded_file)
-            
-            if extracted_data:
-                # Score the resume
+            if key in seen_hashes:
+                # Identical content was already scored against these requirements
+                resume_data = {
+                    **seen_hashes[key],
+                    'filename': uploaded_file.name,
+                    'processed_at': datetime.now()
+                }
+            else:
+                extracted_data = extracted_results[first_index[key]]
+                if not extracted_data:
+                    st.error(f"Failed to process {uploaded_file.name}")
+                    continue
+                
                 score_data = st.session_state.scoring_engine.score_resume(
                     extracted_data, 
                     st.session_state.job_requirements
@@ -357,16 +308,22 @@ def process_uploaded_resumes(uploaded_files):
                     **extracted_data,
                     **score_data
                 }
-                
-                st.session_state.processed_resumes.append(resume_data)
-                processed_count += 1
-            else:
-                st.error(f"Failed to process {uploaded_file.name}")
+                seen_hashes[key] = resume_data
+            
+            new_resumes.append(resume_data)
                 
         except Exception as e:
             st.error(f"Error processing {uploaded_file.name}: {str(e)}")
-        
-        progress_bar.progress((i + 1) / total_files)
+    
+    st.session_state.processed_resumes.extend(new_resumes)
+    for resume_data in new_resumes:
+        # Keep the first upload for a repeated filename, as the details lookup always has
+        st.session_state.resumes_by_filename.setdefault(resume_data['filename'], resume_data)
+    st.session_state.candidate_names += tuple(resume_data['filename'] for resume_data in new_resumes)
+    processed_count = len(new_resumes)
+    if processed_count > 0:
+        _refresh_resumes_frame()
+        _refresh_score_array()
     
     status_text.text("Processing complete!")
     st.success(f"Successfully processed {processed_count} out of {total_files} resumes")
@@ -374,6 +331,192 @@ def process_uploaded_resumes(uploaded_files):
     if processed_count > 0:
         st.rerun()
 
+def _extract_in_pool(uploaded_files, indices, extracted_results, progress_bar):
+    """Extract the resumes at the given upload positions on a worker pool"""
+    total_files = len(indices)
+    pending = {}
+    shared_blocks = {}
+    completed = 0
+    
+    # Each task parses a chunk of files so workers can batch their spaCy calls,
+    # while still spreading small uploads across every worker and leaving room
+    # within MAX_IN_FLIGHT for every worker to have a chunk
+    chunk_size = max(1, min(SPACY_BATCH_SIZE, -(-total_files // MAX_WORKERS), MAX_IN_FLIGHT // MAX_WORKERS))
+    chunks = [indices[start:start + chunk_size] for start in range(0, total_files, chunk_size)]
+    
+    shared_budget = _shared_memory_budget()
+    
+    def submit(executor, chunk):
+        files = [uploaded_files[i] for i in chunk]
+        
+        # Hand worker processes shared memory blocks instead of pickling the bytes, as long
+        # as all sessions' blocks fit the budget; anything beyond it is pickled as before
+        blocks = []
+        tasks = []
+        try:
+            for uploaded_file in files:
+                data = uploaded_file.getvalue()
+                if data and reserve_shared_memory(len(data), shared_budget):
+                    try:
+                        shm = shared_memory.SharedMemory(create=True, size=len(data))
+                    except BaseException:
+                        release_shared_memory(len(data))
+                        raise
+                    blocks.append((shm, len(data)))
+                    shm.buf[:len(data)] = data
+                    data = (shm.name, len(data))
+                tasks.append((uploaded_file.name, uploaded_file.type, data))
+            future = executor.submit(extract_resume_shared, tasks)
+        except BaseException:
+            release(blocks)
+            raise
+        shared_blocks[future] = blocks
+        return future
+    
+    def release(blocks):
+        for shm, reserved in blocks:
+            release_shared_memory(reserved)
+            shm.close()
+            try:
+                shm.unlink()
+            except FileNotFoundError:
+                pass
+    
+    def collect(future):
+        chunk = pending.pop(future)
+        pool = submitted_to.pop(future)
+        # The task is done with its blocks whether it succeeded or not
+        release(shared_blocks.pop(future, ()))
+        try:
+            for i, (extracted_data, messages) in zip(chunk, future.result()):
+                extracted_results[i] = extracted_data
+                # Workers can't reach the page, so their messages are shown from here
+                show_messages(messages)
+        except BrokenProcessPool as e:
+            # A worker died, which fails every task on its pool; run each chunk once
+            # more on a fresh pool before giving up on it
+            restart_pool(pool)
+            if tuple(chunk) not in retried:
+                retried.add(tuple(chunk))
+                try:
+                    dispatch(chunk)
+                    return
+                except BrokenProcessPool as retry_error:
+                    e = retry_error
+            fail(chunk, e)
+            return
+        except Exception as e:
+            fail(chunk, e)
+            return
+        advance(chunk)
+    
+    def fail(chunk, error):
+        for i in chunk:
+            st.error(f"Error processing {uploaded_files[i].name}: {str(error)}")
+        advance(chunk)
+    
+    def advance(chunk):
+        nonlocal completed
+        completed += len(chunk)
+        progress_bar.progress(completed / total_files)
+    
+    def restart_pool(broken):
+        """Move on to a fresh pool, unless another session already replaced the broken one"""
+        nonlocal executor
+        if _process_pool() is broken:
+            _process_pool.clear()
+        executor = _process_pool()
+    
+    def dispatch(chunk):
+        """Submit a chunk, starting a fresh pool first if the current one is already broken"""
+        try:
+            future = submit(executor, chunk)
+        except BrokenProcessPool:
+            restart_pool(executor)
+            future = submit(executor, chunk)
+        pending[future] = chunk
+        submitted_to[future] = executor
+    
+    executor = _process_pool()
+    submitted_to = {}
+    retried = set()
+    try:
+        for chunk in chunks:
+            # Bound the files submitted (and copied for the workers) rather than the tasks
+            while pending and sum(map(len, pending.values())) + len(chunk) > MAX_IN_FLIGHT:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    collect(future)
+            
+            try:
+                dispatch(chunk)
+            except BrokenProcessPool as e:
+                fail(chunk, e)
+        
+        # Retried chunks join pending as others finish, so wait until none are left
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                collect(future)
+    finally:
+        # The pool outlives this run, so drop work nobody will collect
+        for future in pending:
+            future.cancel()
+        for blocks in shared_blocks.values():
+            release(blocks)
+
+def _shared_memory_budget():
+    """Bytes of uploads that may sit in shared memory at once"""
+    try:
+        # Writing past a full /dev/shm (64 MB by default in Docker) raises SIGBUS, so
+        # leave at least half of whatever is free
+        free = shutil.disk_usage('/dev/shm').free
+    except OSError:
+        return SHARED_MEMORY_BUDGET  # No /dev/shm mount, e.g. on macOS
+    return min(SHARED_MEMORY_BUDGET, free // 2)
+
+@st.cache_resource
+def _process_pool():
+    """Worker pool shared by every session, so workers load spaCy only once"""
+    # Forking would copy the multi-threaded server mid-flight, locks included, so
+    # workers start fresh interpreters instead
+    return ProcessPoolExecutor(max_workers=MAX_WORKERS, mp_context=multiprocessing.get_context('spawn'))
+
+def _refresh_resumes_frame():
+    """Rebuild the session's cached DataFrame of processed resumes"""
+    resumes = st.session_state.processed_resumes
+    df = pd.DataFrame(resumes)
+    
+    # Lowercase each candidate's skills once so filtering is a set lookup per row
+    df['_skills_lower_set'] = df['skills'].map(
+        lambda x: frozenset(skill.lower() for skill in x) if isinstance(x, list) else frozenset()
+    )
+    
+    st.session_state.resumes_frame = df
+    st.session_state.resumes_frame_size = len(resumes)
+    return df
+
+def _resumes_frame():
+    """DataFrame of processed resumes, rebuilt only when the append-only list has grown"""
+    if st.session_state.get('resumes_frame_size') != len(st.session_state.processed_resumes):
+        return _refresh_resumes_frame()
+    return st.session_state.resumes_frame
+
+def _refresh_score_array():
+    """Rebuild the session's cached array of total scores"""
+    resumes = st.session_state.processed_resumes
+    scores = np.fromiter((r['total_score'] for r in resumes), dtype=np.float64, count=len(resumes))
+    st.session_state.score_array = scores
+    return scores
+
+def _score_array():
+    """Array of total scores, rebuilt only when the append-only list has grown"""
+    scores = st.session_state.get('score_array')
+    if scores is None or len(scores) != len(st.session_state.processed_resumes):
+        return _refresh_score_array()
+    return scores
+
+@st.fragment
 def results_dashboard_tab():
     st.markdown("### 📊 Screening Results Dashboard")
     
@@ -381,8 +524,7 @@ def results_dashboard_tab():
         st.info("🔍 No resumes processed yet. Please upload and process resumes first.")
         return
     
-    # Convert to DataFrame
-    df = pd.DataFrame(st.session_state.processed_resumes)
+    df = _resumes_frame()
     
     # Top controls with modern styling
     col1, col2, col3, col4 = st.columns(4)
@@ -399,16 +541,18 @@ def results_dashboard_tab():
     with col4:
         export_button = st.button("📥 Export to CSV", use_container_width=True)
     
-    # Apply filters
-    filtered_df = df[df['total_score'] >= min_score].copy()
+    # Apply filters as one boolean mask and slice the frame once
+    mask = df['total_score'].to_numpy() >= min_score
     if min_experience > 0:
-        filtered_df = filtered_df[filtered_df['experience_years'] >= min_experience]
+        mask &= df['experience_years'].to_numpy() >= min_experience
     if skill_filter:
-        filtered_df = filtered_df[
-            filtered_df['skills'].apply(
-                lambda x: skill_filter.lower() in [skill.lower() for skill in x] if isinstance(x, list) else False
-            )
-        ]
+        skill_filter_lower = skill_filter.lower()
+        mask &= np.fromiter(
+            (skill_filter_lower in skills for skills in df['_skills_lower_set']),
+            dtype=bool,
+            count=len(df)
+        )
+    filtered_df = df.iloc[mask]
     
     # Display results
     st.markdown(f"#### 🎯 Candidates ({len(filtered_df)} / {len(df)})")
@@ -423,9 +567,10 @@ def results_dashboard_tab():
     display_df['rank'] = display_df.index + 1
     
     # Format skills for display
-    display_df['skills_display'] = display_df['skills'].apply(
-        lambda x: ', '.join(x[:3]) + ('...' if len(x) > 3 else '') if isinstance(x, list) else 'N/A'
-    )
+    skills = display_df['skills']
+    display_df['skills_display'] = (
+        skills.str[:3].str.join(', ') + np.where(skills.str.len() > 3, '...', '')
+    ).fillna('N/A')
     
     # Create display dataframe
     columns_to_show = ['rank', 'filename', 'name', 'total_score', 'experience_years', 'education', 'skills_display']
@@ -460,7 +605,7 @@ def results_dashboard_tab():
     
     # Export functionality
     if export_button:
-        csv_data = export_to_csv(filtered_df.to_dict('records'))
+        csv_data = export_to_csv(filtered_df)
         st.download_button(
             label="📥 Download CSV",
             data=csv_data,
@@ -469,6 +614,7 @@ def results_dashboard_tab():
             use_container_width=True
         )
 
+@st.fragment
 def candidate_details_tab():
     st.header("Detailed Candidate Information")
     
@@ -477,15 +623,11 @@ def candidate_details_tab():
         return
     
     # Select candidate
-    candidate_names = [resume['filename'] for resume in st.session_state.processed_resumes]
-    selected_candidate = st.selectbox("Select Candidate", candidate_names)
+    selected_candidate = st.selectbox("Select Candidate", st.session_state.candidate_names)
     
     if selected_candidate:
         # Find selected resume data
-        selected_resume = next(
-            resume for resume in st.session_state.processed_resumes 
-            if resume['filename'] == selected_candidate
-        )
+        selected_resume = st.session_state.resumes_by_filename[selected_candidate]
         
         # Display detailed information
         col1, col2 = st.columns(2)
@@ -508,9 +650,11 @@ def candidate_details_tab():
             st.subheader("🔧 Skills Analysis")
             all_skills = selected_resume.get('skills', [])
             required_skills = st.session_state.job_requirements['required_skills']
+            required_set = set(required_skills)
+            resume_skill_set = {skill.lower() for skill in all_skills}
             
-            matched_skills = [skill for skill in all_skills if skill.lower() in required_skills]
-            missing_skills = [skill for skill in required_skills if skill not in [s.lower() for s in all_skills]]
+            matched_skills = [skill for skill in all_skills if skill.lower() in required_set]
+            missing_skills = [skill for skill in required_skills if skill not in resume_skill_set]
             
             if matched_skills:
                 st.success("**Matched Skills:**")
@@ -522,12 +666,101 @@ def candidate_details_tab():
                 for skill in missing_skills:
                     st.write(f"❌ {skill}")
             
-            additional_skills = [skill for skill in all_skills if skill.lower() not in required_skills]
+            additional_skills = [skill for skill in all_skills if skill.lower() not in required_set]
             if additional_skills:
                 st.info("**Additional Skills:**")
                 for skill in additional_skills[:10]:  # Show top 10
                     st.write(f"➕ {skill}")
 
+@st.cache_data(show_spinner=False, max_entries=20)
+def _analytics_frame(pool_key, _resumes, required_skills):
+    """
+    Build the analytics DataFrame and per-candidate aggregates
+    
+    Args:
+        pool_key: Hashable identity of the candidate pool, used as the cache key
+        _resumes: Processed resume records (not hashed by Streamlit)
+        required_skills: Required skills of the current job, as a tuple
+        
+    Returns:
+        Tuple of (DataFrame, skill counts, score range counts, matched-skill counts per candidate)
+    """
+    df = pd.DataFrame(_resumes)
+    
+    # Count skills across the whole pool in one pass
+    skill_lists = [r['skills'] for r in _resumes if isinstance(r.get('skills'), list) and r['skills']]
+    if skill_lists:
+        skill_counts = pd.Series(np.concatenate([np.asarray(skills, dtype=object) for skills in skill_lists])).value_counts()
+    else:
+        skill_counts = pd.Series(dtype=object)
+    
+    # Bucket every score in one pass, then list the ranges best first
+    score_buckets = pd.cut(
+        df['total_score'],
+        bins=SCORE_RANGE_EDGES,
+        labels=SCORE_RANGE_LABELS,
+        right=False
+    )
+    bucket_counts = score_buckets.value_counts(sort=False)
+    score_ranges = {label: int(bucket_counts[label]) for label in reversed(SCORE_RANGE_LABELS)}
+    
+    skill_match_stats = count_skill_matches(_resumes, required_skills)
+    
+    return df, skill_counts, score_ranges, skill_match_stats
+
+@st.cache_data(show_spinner=False, max_entries=20)
+def _analytics_figures(pool_key, _df, _skill_counts):
+    """Build the analytics charts, cached per candidate pool"""
+    # Imported here so sessions that never open Analytics don't pay for plotly
+    import plotly.express as px
+    
+    fig_hist = px.histogram(
+        _df, 
+        x='total_score', 
+        nbins=15, 
+        title="Distribution of Candidate Scores",
+        color_discrete_sequence=['#007bff']
+    )
+    fig_hist.update_layout(showlegend=False, **CHART_LAYOUT)
+    
+    fig_scatter = px.scatter(
+        _df, 
+        x='experience_years', 
+        y='total_score',
+        title="Experience Years vs Total Score",
+        hover_data=['name'],
+        color='total_score',
+        color_continuous_scale='Viridis',
+        size='total_score',
+        size_max=15
+    )
+    fig_scatter.update_layout(**CHART_LAYOUT)
+    
+    fig_bar = None
+    if not _skill_counts.empty:
+        top_skills = _skill_counts.head(12)
+        fig_bar = px.bar(
+            x=top_skills.values,
+            y=top_skills.index,
+            orientation='h',
+            title="Top Skills in Candidate Pool",
+            color=top_skills.values,
+            color_continuous_scale='Blues'
+        )
+        fig_bar.update_layout(yaxis={'categoryorder': 'total ascending'}, showlegend=False, **CHART_LAYOUT)
+    
+    education_counts = _df['education'].value_counts()
+    fig_pie = px.pie(
+        values=education_counts.values,
+        names=education_counts.index,
+        title="Education Distribution",
+        color_discrete_sequence=px.colors.qualitative.Set3
+    )
+    fig_pie.update_layout(**CHART_LAYOUT)
+    
+    return fig_hist, fig_scatter, fig_bar, fig_pie
+
+@st.fragment
 def analytics_tab():
     st.markdown("### 📈 Screening Analytics")
     
@@ -535,7 +768,10 @@ def analytics_tab():
         st.info("📊 No data available for analytics. Process some resumes first!")
         return
     
-    df = pd.DataFrame(st.session_state.processed_resumes)
+    resumes = st.session_state.processed_resumes
+    required_skills = tuple(st.session_state.job_requirements.get('required_skills', []))
+    pool_key = tuple((r['filename'], r['processed_at'], r['total_score']) for r in resumes)
+    df, skill_counts, score_ranges, skill_match_stats = _analytics_frame(pool_key, resumes, required_skills)
     
     # Summary metrics at the top
     st.markdown("#### 📊 Overview Metrics")
@@ -556,94 +792,26 @@ def analytics_tab():
     st.markdown("---")
     
     # Charts section
+    fig_hist, fig_scatter, fig_bar, fig_pie = _analytics_figures(pool_key, df, skill_counts)
     col1, col2 = st.columns(2)
     
     with col1:
         # Score distribution with clean styling
         st.markdown("#### 📊 Score Distribution")
-        fig_hist = px.histogram(
-            df, 
-            x='total_score', 
-            nbins=15, 
-            title="Distribution of Candidate Scores",
-            color_discrete_sequence=['#007bff']
-        )
-        fig_hist.update_layout(
-            plot_bgcolor='white',
-            paper_bgcolor='white',
-            font=dict(color='#212529'),
-            title_font_size=16,
-            showlegend=False
-        )
         st.plotly_chart(fig_hist, use_container_width=True)
         
         # Experience vs Score correlation
         st.markdown("#### 🎯 Experience vs Performance")
-        fig_scatter = px.scatter(
-            df, 
-            x='experience_years', 
-            y='total_score',
-            title="Experience Years vs Total Score",
-            hover_data=['name'],
-            color='total_score',
-            color_continuous_scale='Viridis',
-            size='total_score',
-            size_max=15
-        )
-        fig_scatter.update_layout(
-            plot_bgcolor='white',
-            paper_bgcolor='white',
-            font=dict(color='#212529'),
-            title_font_size=16
-        )
         st.plotly_chart(fig_scatter, use_container_width=True)
     
     with col2:
         # Top skills analysis
         st.markdown("#### 🔧 Most Common Skills")
-        all_skills = []
-        for resume in st.session_state.processed_resumes:
-            skills = resume.get('skills', [])
-            if isinstance(skills, list):
-                all_skills.extend(skills)
-        
-        if all_skills:
-            skills_df = pd.DataFrame({'skill': all_skills})
-            skill_counts = skills_df['skill'].value_counts().head(12)
-            
-            fig_bar = px.bar(
-                x=skill_counts.values,
-                y=skill_counts.index,
-                orientation='h',
-                title="Top Skills in Candidate Pool",
-                color=skill_counts.values,
-                color_continuous_scale='Blues'
-            )
-            fig_bar.update_layout(
-                yaxis={'categoryorder': 'total ascending'},
-                plot_bgcolor='white',
-                paper_bgcolor='white',
-                font=dict(color='#212529'),
-                title_font_size=16,
-                showlegend=False
-            )
+        if fig_bar is not None:
             st.plotly_chart(fig_bar, use_container_width=True)
         
         # Education distribution
         st.markdown("#### 🎓 Education Levels")
-        education_counts = df['education'].value_counts()
-        fig_pie = px.pie(
-            values=education_counts.values,
-            names=education_counts.index,
-            title="Education Distribution",
-            color_discrete_sequence=px.colors.qualitative.Set3
-        )
-        fig_pie.update_layout(
-            plot_bgcolor='white',
-            paper_bgcolor='white',
-            font=dict(color='#212529'),
-            title_font_size=16
-        )
         st.plotly_chart(fig_pie, use_container_width=True)
     
     # Advanced analytics
@@ -654,13 +822,6 @@ def analytics_tab():
     
     with insights_col1:
         # Score ranges
-        score_ranges = {
-            'Excellent (85-100)': len(df[df['total_score'] >= 85]),
-            'Good (70-84)': len(df[(df['total_score'] >= 70) & (df['total_score'] < 85)]),
-            'Fair (55-69)': len(df[(df['total_score'] >= 55) & (df['total_score'] < 70)]),
-            'Poor (0-54)': len(df[df['total_score'] < 55])
-        }
-        
         st.markdown("**Score Distribution:**")
         for range_name, count in score_ranges.items():
             percentage = (count / len(df)) * 100 if len(df) > 0 else 0
@@ -668,22 +829,16 @@ def analytics_tab():
     
     with insights_col2:
         # Skills match analysis
-        req_skills = set(st.session_state.job_requirements.get('required_skills', []))
-        if req_skills and all_skills:
-            skill_match_stats = []
-            for resume in st.session_state.processed_resumes:
-                resume_skills = set([s.lower() for s in resume.get('skills', [])])
-                matched = len(req_skills.intersection(resume_skills))
-                skill_match_stats.append(matched)
-            
-            avg_matched = sum(skill_match_stats) / len(skill_match_stats) if skill_match_stats else 0
-            max_matched = max(skill_match_stats) if skill_match_stats else 0
+        req_skills = set(required_skills)
+        if req_skills and not skill_counts.empty:
+            avg_matched = skill_match_stats.mean() if skill_match_stats.size else 0
+            max_matched = skill_match_stats.max() if skill_match_stats.size else 0
             
             st.markdown("**Skills Matching:**")
             st.write(f"• Required skills: {len(req_skills)}")
             st.write(f"• Average matched: {avg_matched:.1f}")
             st.write(f"• Best match: {max_matched}")
-            st.write(f"• Perfect matches: {skill_match_stats.count(len(req_skills))}")
+            st.write(f"• Perfect matches: {int((skill_match_stats == len(req_skills)).sum())}")
 
 if __name__ == "__main__":
     main()
@@ -1,194 +1,288 @@
+import logging
+import os
 import re
+import ahocorasick
 import spacy
-from typing import Dict, List, Any, Optional
-import streamlit as st
+from functools import cache
+from types import MappingProxyType
+from typing import Dict, List, Any, Mapping, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Documents per spaCy batch when parsing several resumes at once
+SPACY_BATCH_SIZE = int(os.environ.get('RESUME_SPACY_BATCH_SIZE', '32'))
+
+# Most skills kept per resume; the scan stops once this many are found
+MAX_SKILLS = 50
+
+# Shown when en_core_web_sm isn't installed; extraction then runs without NER
+SPACY_MODEL_MISSING = "spaCy English model not found. Please install it using: python -m spacy download en_core_web_sm"
+
+# en_core_web_sm components that entity recognition doesn't depend on
+SPACY_EXCLUDED_COMPONENTS = ["tagger", "parser", "senter", "attribute_ruler", "lemmatizer"]
+
+# Patterns used on every resume are compiled once at import time
+_WS_RE = re.compile(r'\s+')
+_EMAIL_RE = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}\b')
+# An optional country code followed by a 3-3-4 number (separators and area-code
+# parentheses optional) or a bare 10-digit run
+_PHONE_RE = re.compile(r'(?:\+\d{1,3}[-.\s]?)?(?:\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}|\d{10})')
+# A duration such as "5 years" or "3.5+ yrs". Possessive quantifiers rule out backtracking,
+# and starting only at the first digit of a run avoids rescanning long digit runs
+_EXP_RE = re.compile(r'(?<!\d)(\d++(?:\.\d*+)?+)\s*+(?:\+\s*+)?+(?:years?+|yrs?+)')
+# What must follow a duration for it to count as experience ("in", "of work experience", ...)
+_EXP_AFTER_RE = re.compile(r'\s++(?:in|with|of)|\s*+(?:of\s++)?+(?:professional\s++)?+(?:work\s++)?+experience')
+_CERT_RES = [
+    re.compile(r'certified\s+in\s+([^.\n]+)', re.IGNORECASE),
+    re.compile(r'certification\s*:?\s*([^.\n]+)', re.IGNORECASE),
+    re.compile(r'cert\.\s*([^.\n]+)', re.IGNORECASE),
+    re.compile(r'([A-Z]{2,}\s+certified)', re.IGNORECASE),
+]
+
+# Punctuation allowed inside the words of a name line ("J. Smith, Jr")
+_NAME_PUNCTUATION = str.maketrans('', '', '.,')
+
+def _preprocess(text: str):
+    """Clean and normalize text, returning it with its lowercased copy"""
+    # Remove extra whitespaces and normalize
+    cleaned = _WS_RE.sub(' ', text).strip()
+    return cleaned, cleaned.lower()
+
+def _follows_experience_label(text_lower: str, start: int) -> bool:
+    """Whether the text just before start reads "experience", optionally followed by a colon"""
+    i = start
+    while i > 0 and text_lower[i - 1].isspace():
+        i -= 1
+    if i > 0 and text_lower[i - 1] == ':':
+        i -= 1
+        while i > 0 and text_lower[i - 1].isspace():
+            i -= 1
+    return text_lower.endswith('experience', 0, i)
+
+# Comprehensive list of technical skills and keywords
+SKILL_KEYWORDS: Tuple[str, ...] = (
+    # Programming Languages
+    'python', 'java', 'javascript', 'typescript', 'c++', 'c#', 'php', 'ruby', 'go', 'rust',
+    'swift', 'kotlin', 'scala', 'r', 'matlab', 'perl', 'shell', 'bash', 'powershell',
+    
+    # Web Technologies
+    'html', 'css', 'react', 'angular', 'vue', 'node.js', 'express', 'django', 'flask',
+    'spring', 'laravel', 'rails', 'asp.net', 'jquery', 'bootstrap', 'sass', 'less',
+    
+    # Databases
+    'sql', 'mysql', 'postgresql', 'oracle', 'mongodb', 'redis', 'elasticsearch',
+    'cassandra', 'dynamodb', 'sqlite', 'mariadb',
+    
+    # Cloud & DevOps
+    'aws', 'azure', 'gcp', 'docker', 'kubernetes', 'jenkins', 'git', 'gitlab', 'github',
+    'terraform', 'ansible', 'chef', 'puppet', 'ci/cd', 'devops',
+    
+    # Data Science & ML
+    'machine learning', 'deep learning', 'artificial intelligence', 'data science',
+    'pandas', 'numpy', 'scikit-learn', 'tensorflow', 'pytorch', 'keras', 'opencv',
+    'nlp', 'computer vision', 'statistics', 'data analysis', 'big data', 'hadoop', 'spark',
+    
+    # Mobile Development
+    'android', 'ios', 'react native', 'flutter', 'xamarin', 'cordova', 'ionic',
+    
+    # Other Technologies
+    'microservices', 'api', 'rest', 'graphql', 'soap', 'json', 'xml', 'agile', 'scrum',
+    'kanban', 'jira', 'confluence', 'slack', 'linux', 'windows', 'macos',
+    
+    # Soft Skills
+    'communication', 'leadership', 'teamwork', 'problem solving', 'analytical thinking',
+    'project management', 'time management', 'adaptability', 'creativity', 'innovation'
+)
+
+# Education level mappings
+EDUCATION_KEYWORDS: Mapping[str, int] = MappingProxyType({
+    'phd': 4, 'doctorate': 4, 'ph.d': 4,
+    'master': 3, 'masters': 3, 'mba': 3, 'ms': 3, 'ma': 3, 'm.s': 3, 'm.a': 3,
+    'bachelor': 2, 'bachelors': 2, 'bs': 2, 'ba': 2, 'b.s': 2, 'b.a': 2, 'be': 2, 'b.e': 2,
+    'associate': 1, 'diploma': 1, 'certificate': 1,
+    'high school': 0, 'secondary': 0, 'graduation': 0
+})
+
+@cache
+def _load_spacy_model():
+    """Load spaCy model once per process; a failed load raises, so it is retried next time"""
+    # Only the entity recognizer is used, so skip loading the other components
+    return spacy.load("en_core_web_sm", exclude=SPACY_EXCLUDED_COMPONENTS)
+
+def get_spacy_model():
+    """The shared spaCy model, or None while it isn't installed"""
+    try:
+        return _load_spacy_model()
+    except OSError:
+        # This also runs in pool workers, which have no page to show an error on
+        logger.warning(SPACY_MODEL_MISSING)
+        # Fallback to basic processing without advanced NLP
+        return None
+
+@cache
+def _build_skill_automaton() -> ahocorasick.Automaton:
+    """Build an Aho-Corasick automaton over the lowercased skill keywords"""
+    automaton = ahocorasick.Automaton()
+    for skill in SKILL_KEYWORDS:
+        keyword = skill.lower()
+        automaton.add_word(keyword, (len(keyword), skill.title()))
+    automaton.make_automaton()
+    return automaton
+
+@cache
+def _build_education_automaton() -> ahocorasick.Automaton:
+    """Build an Aho-Corasick automaton over the education keywords"""
+    automaton = ahocorasick.Automaton()
+    for education, level in EDUCATION_KEYWORDS.items():
+        automaton.add_word(education, (len(education), level))
+    automaton.make_automaton()
+    return automaton
+
+def _is_word_char(char: str) -> bool:
+    """Match the character class used by the regex word boundary \\b"""
+    return char.isalnum() or char == '_'
+
+def _on_word_boundaries(text: str, start: int, end: int) -> bool:
+    """Whether text[start:end + 1] is delimited like a regex \\b...\\b match"""
+    before = text[start - 1] if start > 0 else ' '
+    after = text[end + 1] if end < len(text) - 1 else ' '
+    return (_is_word_char(before) != _is_word_char(text[start]) and
+            _is_word_char(text[end]) != _is_word_char(after))
 
 class NLPExtractor:
     """Extracts structured information from resume text using NLP techniques"""
     
     def __init__(self):
-        self.nlp = self._load_spacy_model()
-        self.skill_keywords = self._load_skill_keywords()
-        self.education_keywords = self._load_education_keywords()
+        # The keywords and automata are built once per process and shared
+        self.skill_keywords = SKILL_KEYWORDS
+        self.education_keywords = EDUCATION_KEYWORDS
+        self._skill_automaton = _build_skill_automaton()
+        self._education_automaton = _build_education_automaton()
     
-    @st.cache_resource
-    def _load_spacy_model(_self):
-        """Load spaCy model with caching"""
-        try:
-            return spacy.load("en_core_web_sm")
-        except OSError:
-            st.error("spaCy English model not found. Please install it using: python -m spacy download en_core_web_sm")
-            # Fallback to basic processing without advanced NLP
-            return None
-    
-    def _load_skill_keywords(self) -> List[str]:
-        """Load comprehensive list of technical skills and keywords"""
-        return [
-            # Programming Languages
-            'python', 'java', 'javascript', 'typescript', 'c++', 'c#', 'php', 'ruby', 'go', 'rust',
-            'swift', 'kotlin', 'scala', 'r', 'matlab', 'perl', 'shell', 'bash', 'powershell',
-            
-            # Web Technologies
-            'html', 'css', 'react', 'angular', 'vue', 'node.js', 'express', 'django', 'flask',
-            'spring', 'laravel', 'rails', 'asp.net', 'jquery', 'bootstrap', 'sass', 'less',
-            
-            # Databases
-            'sql', 'mysql', 'postgresql', 'oracle', 'mongodb', 'redis', 'elasticsearch',
-            'cassandra', 'dynamodb', 'sqlite', 'mariadb',
-            
-            # Cloud & DevOps
-            'aws', 'azure', 'gcp', 'docker', 'kubernetes', 'jenkins', 'git', 'gitlab', 'github',
-            'terraform', 'ansible', 'chef', 'puppet', 'ci/cd', 'devops',
-            
-            # Data Science & ML
-            'machine learning', 'deep learning', 'artificial intelligence', 'data science',
-            'pandas', 'numpy', 'scikit-learn', 'tensorflow', 'pytorch', 'keras', 'opencv',
-            'nlp', 'computer vision', 'statistics', 'data analysis', 'big data', 'hadoop', 'spark',
-            
-            # Mobile Development
-            'android', 'ios', 'react native', 'flutter', 'xamarin', 'cordova', 'ionic',
-            
-            # Other Technologies
-            'microservices', 'api', 'rest', 'graphql', 'soap', 'json', 'xml', 'agile', 'scrum',
-            'kanban', 'jira', 'confluence', 'slack', 'linux', 'windows', 'macos',
-            
-            # Soft Skills
-            'communication', 'leadership', 'teamwork', 'problem solving', 'analytical thinking',
-            'project management', 'time management', 'adaptability', 'creativity', 'innovation'
-        ]
-    
-    def _load_education_keywords(self) -> Dict[str, int]:
-        """Load education level mappings"""
-        return {
-            'phd': 4, 'doctorate': 4, 'ph.d': 4,
-            'master': 3, 'masters': 3, 'mba': 3, 'ms': 3, 'ma': 3, 'm.s': 3, 'm.a': 3,
-            'bachelor': 2, 'bachelors': 2, 'bs': 2, 'ba': 2, 'b.s': 2, 'b.a': 2, 'be': 2, 'b.e': 2,
-            'associate': 1, 'diploma': 1, 'certificate': 1,
-            'high school': 0, 'secondary': 0, 'graduation': 0
-        }
+    @property
+    def nlp(self):
+        """The spaCy model, looked up on use so installing it takes effect without a restart"""
+        return get_spacy_model()
     
     def extract_information(self, text: str) -> Dict[str, Any]:
         """Extract structured information from resume text"""
+        return self.extract_information_batch([text])[0]
+    
+    def extract_information_batch(self, texts: List[str]) -> List[Dict[str, Any]]:
+        """
+        Extract structured information from several resume texts
         
-        # Clean and preprocess text
-        cleaned_text = self._clean_text(text)
+        Args:
+            texts: Raw resume texts
+            
+        Returns:
+            List of extracted information dictionaries, in input order
+        """
         
-        # Extract different components
-        extracted_info = {
-            'name': self._extract_name(cleaned_text),
-            'email': self._extract_email(cleaned_text),
-            'phone': self._extract_phone(cleaned_text),
-            'skills': self._extract_skills(cleaned_text),
-            'experience_years': self._extract_experience_years(cleaned_text),
-            'education': self._extract_education(cleaned_text),
-            'certifications': self._extract_certifications(cleaned_text),
-            'organizations': self._extract_organizations(cleaned_text) if self.nlp else []
-        }
+        # Clean and preprocess text, lowercasing each document once
+        preprocessed = [_preprocess(text) for text in texts]
+        cleaned_texts = [cleaned_text for cleaned_text, _ in preprocessed]
         
-        return extracted_info
-    
-    def _clean_text(self, text: str) -> str:
-        """Clean and normalize text"""
-        # Remove extra whitespaces and normalize
-        text = re.sub(r'\s+', ' ', text)
-        text = text.strip()
-        return text
-    
-    def _extract_name(self, text: str) -> str:
-        """Extract candidate name using NLP and heuristics"""
-        if not self.nlp:
-            return self._extract_name_fallback(text)
+        # Parse all documents in batches; names and organizations share one parse
+        docs = [None] * len(cleaned_texts)
+        if self.nlp:
+            try:
+                docs = list(self.nlp.pipe(cleaned_texts, batch_size=SPACY_BATCH_SIZE))
+            except Exception:
+                # One bad document (e.g. longer than nlp.max_length) fails the whole
+                # batch, so parse them one by one and skip only the ones that fail
+                docs = [self._parse(cleaned_text) for cleaned_text in cleaned_texts]
         
+        results = []
+        for text, (cleaned_text, text_lower), doc in zip(texts, preprocessed, docs):
+            # Extract different components
+            results.append({
+                'name': self._extract_name(text, doc),
+                'email': self._extract_email(cleaned_text),
+                'phone': self._extract_phone(cleaned_text),
+                'skills': self._extract_skills(text_lower),
+                'experience_years': self._extract_experience_years(text_lower),
+                'education': self._extract_education(text_lower),
+                'certifications': self._extract_certifications(cleaned_text),
+                'organizations': self._extract_organizations(doc)
+            })
+        
+        return results
+    
+    def _parse(self, text: str):
+        """Parse one document with spaCy, or return None if it can't be parsed"""
         try:
-            doc = self.nlp(text[:500])  # Process first 500 characters
-            
-            # Look for PERSON entities
-            for ent in doc.ents:
-                if ent.label_ == "PERSON" and len(ent.text.split()) >= 2:
-                    return ent.text.strip()
-            
-            # Fallback to heuristic method
-            return self._extract_name_fallback(text)
-            
+            return self.nlp(text)
         except Exception:
-            return self._extract_name_fallback(text)
+            return None
+    
+    def _extract_name(self, text: str, doc=None) -> str:
+        """Extract candidate name using heuristics, then NLP"""
+        # Most resumes open with the name on its own line, which is cheap to spot
+        name = self._extract_name_heuristic(text)
+        if name or doc is None:
+            return name or "Name not found"
+        
+        # Look for PERSON entities in the first 500 characters
+        for ent in doc.ents:
+            if ent.end_char > 500:
+                break
+            if ent.label_ == "PERSON" and len(ent.text.split()) >= 2:
+                return ent.text.strip()
+        
+        return "Name not found"
     
-    def _extract_name_fallback(self, text: str) -> str:
-        """Fallback method to extract name without NLP"""
-        lines = text.split('\n')[:5]  # Check first 5 lines
+    def _extract_name_heuristic(self, text: str) -> Optional[str]:
+        """Find a name-like line at the top of the raw text, without NLP"""
+        lines = text.split('\n', 3)[:3]  # Check first 3 lines
         
         for line in lines:
             line = line.strip()
             # Look for lines that could be names (2-4 words, mostly alphabetic)
             words = line.split()
-            if (2 <= len(words) <= 4 and 
-                all(word.replace('.', '').replace(',', '').isalpha() for word in words) and
-                len(line) < 50):
+            if (2 <= len(words) <= 4 and
+                len(line) < 50 and
+                all(word.translate(_NAME_PUNCTUATION).isalpha() for word in words)):
                 return line
         
-        return "Name not found"
+        return None
     
     def _extract_email(self, text: str) -> str:
         """Extract email address"""
-        email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-        emails = re.findall(email_pattern, text)
+        emails = _EMAIL_RE.findall(text)
         return emails[0] if emails else "Email not found"
     
     def _extract_phone(self, text: str) -> str:
         """Extract phone number"""
-        phone_patterns = [
-            r'(\+\d{1,3}[-.\s]?)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}',
-            r'(\+\d{1,3}[-.\s]?)?\d{3}[-.\s]?\d{3}[-.\s]?\d{4}',
-            r'(\+\d{1,3}[-.\s]?)?\d{10}'
-        ]
-        
-        for pattern in phone_patterns:
-            phones = re.findall(pattern, text)
-            if phones:
-                return phones[0] if isinstance(phones[0], str) else ''.join(phones[0])
-        
-        return "Phone not found"
+        match = _PHONE_RE.search(text)
+        return match.group(0) if match else "Phone not found"
     
-    def _extract_skills(self, text: str) -> List[str]:
-        """Extract skills from text using keyword matching"""
-        text_lower = text.lower()
-        found_skills = []
-        
-        for skill in self.skill_keywords:
-            # Use word boundaries to avoid partial matches
-            pattern = r'\b' + re.escape(skill.lower()) + r'\b'
-            if re.search(pattern, text_lower):
-                found_skills.append(skill.title())
+    def _extract_skills(self, text_lower: str) -> List[str]:
+        """Extract skills from lowercased text using keyword matching"""
+        found_skills = set()
         
-        # Remove duplicates and sort
-        found_skills = list(set(found_skills))
-        found_skills.sort()
+        # One pass finds every keyword occurrence, including overlapping ones
+        for end, (length, skill) in self._skill_automaton.iter(text_lower):
+            # Check word boundaries to avoid partial matches
+            if _on_word_boundaries(text_lower, end - length + 1, end):
+                found_skills.add(skill)
+                if len(found_skills) >= MAX_SKILLS:
+                    break  # Limit to the first 50 skills mentioned
         
-        return found_skills[:50]  # Limit to top 50 skills
+        return sorted(found_skills)
     
-    def _extract_experience_years(self, text: str) -> float:
-        """Extract years of experience from text"""
+    def _extract_experience_years(self, text_lower: str) -> float:
+        """Extract years of experience from lowercased text"""
         
-        # Patterns to match experience mentions
-        experience_patterns = [
-            r'(\d+\.?\d*)\s*(?:\+\s*)?(?:years?|yrs?)\s+(?:of\s+)?experience',
-            r'(\d+\.?\d*)\s*(?:\+\s*)?(?:years?|yrs?)\s+(?:in|with|of)',
-            r'experience\s*:?\s*(\d+\.?\d*)\s*(?:\+\s*)?(?:years?|yrs?)',
-            r'(\d+\.?\d*)\s*(?:\+\s*)?(?:years?|yrs?)\s*(?:of\s+)?(?:professional\s+)?(?:work\s+)?experience'
-        ]
-        
-        text_lower = text.lower()
         years_found = []
         
-        for pattern in experience_patterns:
-            matches = re.findall(pattern, text_lower)
-            for match in matches:
-                try:
-                    years = float(match)
-                    if 0 <= years <= 50:  # Reasonable range
-                        years_found.append(years)
-                except ValueError:
-                    continue
+        # Find each duration once, then check the words around it for an experience mention
+        for match in _EXP_RE.finditer(text_lower):
+            if (_EXP_AFTER_RE.match(text_lower, match.end()) or
+                    _follows_experience_label(text_lower, match.start())):
+                years = float(match.group(1))
+                if 0 <= years <= 50:  # Reasonable range
+                    years_found.append(years)
         
         if years_found:
             return max(years_found)  # Return the highest experience mentioned
@@ -202,17 +296,16 @@ class NLPExtractor:
         
         return 0.0
     
-    def _extract_education(self, text: str) -> str:
-        """Extract highest education level"""
-        text_lower = text.lower()
+    def _extract_education(self, text_lower: str) -> str:
+        """Extract highest education level from lowercased text"""
         highest_level = 0
         highest_education = "Not specified"
         
-        for education, level in self.education_keywords.items():
-            if education in text_lower:
-                if level > highest_level:
-                    highest_level = level
-                    highest_education = self._format_education_level(level)
+        # One pass over the text; whole words only, so "ms" doesn't match inside "systems"
+        for end, (length, level) in self._education_automaton.iter(text_lower):
+            if level > highest_level and _on_word_boundaries(text_lower, end - length + 1, end):
+                highest_level = level
+                highest_education = self._format_education_level(level)
         
         return highest_education
     
@@ -229,16 +322,9 @@ class NLPExtractor:
     
     def _extract_certifications(self, text: str) -> List[str]:
         """Extract certifications from text"""
-        cert_patterns = [
-            r'certified\s+in\s+([^.\n]+)',
-            r'certification\s*:?\s*([^.\n]+)',
-            r'cert\.\s*([^.\n]+)',
-            r'([A-Z]{2,}\s+certified)',
-        ]
-        
         certifications = []
-        for pattern in cert_patterns:
-            matches = re.findall(pattern, text, re.IGNORECASE)
+        for pattern in _CERT_RES:
+            matches = pattern.findall(text)
             certifications.extend(matches)
         
         # Clean and filter certifications
@@ -250,22 +336,21 @@ class NLPExtractor:
         
         return list(set(cleaned_certs))[:10]  # Limit to 10 certifications
     
-    def _extract_organizations(self, text: str) -> List[str]:
-        """Extract organization names using NLP"""
-        if not self.nlp:
+    def _extract_organizations(self, doc) -> List[str]:
+        """Extract organization names from a parsed document"""
+        if doc is None:
             return []
         
-        try:
-            doc = self.nlp(text)
-            organizations = []
-            
-            for ent in doc.ents:
-                if ent.label_ == "ORG":
-                    organizations.append(ent.text.strip())
-            
-            # Remove duplicates and filter
-            organizations = list(set(organizations))
-            return [org for org in organizations if len(org) > 2 and len(org) < 100][:20]
-            
-        except Exception:
-            return []
+        organizations = []
+        for ent in doc.ents:
+            if ent.label_ == "ORG":
+                organizations.append(ent.text.strip())
+        
+        # Remove duplicates and filter
+        organizations = list(set(organizations))
+        return [org for org in organizations if len(org) > 2 and len(org) < 100][:20]
+
+@cache
+def get_nlp_extractor() -> NLPExtractor:
+    """Extractor shared by every resume processor in this process"""
+    return NLPExtractor()
@@ -1,16 +1,68 @@
 import streamlit as st
 import PyPDF2
 import docx
+import hashlib
 import io
+import os
 import re
-from typing import Dict, Any, Optional
-from nlp_extractor import NLPExtractor
+import threading
+from collections import OrderedDict
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, as_completed, wait
+from multiprocessing import shared_memory
+from typing import Callable, Dict, Any, List, Optional, Tuple, Union
+from nlp_extractor import get_nlp_extractor
+
+try:
+    import pypdfium2 as pdfium
+    PDFIUM_AVAILABLE = True
+except ImportError:
+    PDFIUM_AVAILABLE = False
+
+# PDFium is not thread-safe, and sessions extract uploads from their own threads
+_pdfium_lock = threading.Lock()
+
+# Most extraction results kept in memory, least recently used evicted first
+EXTRACTION_CACHE_SIZE = 256
+
+# Extracted data shared by every session in this process, keyed by file content
+_extraction_cache: "OrderedDict[Tuple[str, str], Dict[str, Any]]" = OrderedDict()
+_extraction_cache_lock = threading.Lock()
+
+def content_key(uploaded_file) -> Tuple[str, str]:
+    """Cache key for an upload: digest of its bytes plus its file extension"""
+    digest = hashlib.sha256(uploaded_file.getvalue()).hexdigest()
+    return digest, uploaded_file.name.lower().split('.')[-1]
+
+def get_cached_extraction(key: Tuple[str, str]) -> Optional[Dict[str, Any]]:
+    """Look up extracted data for a content key, marking it as recently used"""
+    with _extraction_cache_lock:
+        extracted_info = _extraction_cache.get(key)
+        if extracted_info is not None:
+            _extraction_cache.move_to_end(key)
+        return extracted_info
+
+def store_extraction(key: Tuple[str, str], extracted_info: Dict[str, Any]):
+    """Remember extracted data for a content key, evicting the oldest entries"""
+    with _extraction_cache_lock:
+        _extraction_cache[key] = extracted_info
+        _extraction_cache.move_to_end(key)
+        while len(_extraction_cache) > EXTRACTION_CACHE_SIZE:
+            _extraction_cache.popitem(last=False)
+
+# A message for the user about one file: the Streamlit element to show it with, and its text
+Message = Tuple[str, str]
+
+def show_messages(messages: List[Message]):
+    """Display messages collected while processing a file"""
+    for level, text in messages:
+        # level is 'error' or 'warning'
+        getattr(st, level)(text)
 
 class ResumeProcessor:
     """Handles resume file processing and text extraction"""
     
     def __init__(self):
-        self.nlp_extractor = NLPExtractor()
+        self.nlp_extractor = get_nlp_extractor()
     
     def process_resume(self, uploaded_file) -> Optional[Dict[str, Any]]:
         """
@@ -22,107 +74,239 @@ class ResumeProcessor:
         Returns:
             Dictionary containing extracted information or None if processing fails
         """
-        try:
-            # Extract text based on file type
-            text = self._extract_text(uploaded_file)
+        # Streamlit reruns hand over the same uploads again; reuse their extraction
+        key = content_key(uploaded_file)
+        extracted_info = get_cached_extraction(key)
+        if extracted_info is None:
+            extracted_info = self.process_resumes([uploaded_file])[0]
+            if extracted_info is not None:
+                store_extraction(key, extracted_info)
+        
+        return dict(extracted_info) if extracted_info is not None else None
+    
+    def process_resumes(self, uploaded_files) -> List[Optional[Dict[str, Any]]]:
+        """
+        Process several uploaded resume files, running NLP over them as one batch
+        
+        Args:
+            uploaded_files: Streamlit uploaded file objects
             
-            if not text or len(text.strip()) < 50:
-                st.error(f"Could not extract sufficient text from {uploaded_file.name}")
-                return None
+        Returns:
+            List with the extracted information (or None on failure) for each file, in input order
+        """
+        results, messages = self.collect_resumes(uploaded_files)
+        for file_messages in messages:
+            show_messages(file_messages)
+        
+        return results
+    
+    def collect_resumes(self, uploaded_files) -> Tuple[List[Optional[Dict[str, Any]]], List[List[Message]]]:
+        """
+        Process several uploaded resume files, returning their messages instead of displaying them
+        
+        Nothing here touches Streamlit, so it is safe to call without a script
+        context, e.g. in a worker process.
+        
+        Args:
+            uploaded_files: Streamlit uploaded file objects
             
-            # Extract structured information using NLP
-            extracted_info = self.nlp_extractor.extract_information(text)
+        Returns:
+            Tuple of (extracted information or None for each file, messages for each file), in input order
+        """
+        messages = [[] for _ in uploaded_files]
+        texts = {}
+        for i, uploaded_file in enumerate(uploaded_files):
+            try:
+                # Extract text based on file type; getvalue() shares the upload's
+                # buffer, so the bytes are never copied by read()
+                texts[i] = self._extract_text(uploaded_file.name, uploaded_file.getvalue(), messages[i])
+            except Exception as e:
+                messages[i].append(('error', f"Error processing {uploaded_file.name}: {str(e)}"))
+        
+        return self._process_texts(uploaded_files, texts, messages), messages
+    
+    def process_resumes_parallel(self, uploaded_files, max_workers: Optional[int] = None,
+                                 max_in_flight: Optional[int] = None,
+                                 on_progress: Optional[Callable[[int, int], None]] = None) -> List[Optional[Dict[str, Any]]]:
+        """
+        Process several uploaded resume files, extracting DOCX and TXT text on a thread pool
+        
+        PDFium is not thread-safe, so PDFs are extracted one at a time on the
+        calling thread while the pool works through the other files.
+        
+        Args:
+            uploaded_files: Streamlit uploaded file objects
+            max_workers: Number of extraction threads (defaults to the CPU count)
+            max_in_flight: Most files submitted to the pool at once (defaults to twice max_workers)
+            on_progress: Called with (files extracted, total files) as each extraction finishes,
+                from the calling thread
             
-            # Add raw text for additional processing if needed
-            extracted_info['raw_text'] = text
-            extracted_info['file_type'] = uploaded_file.type
+        Returns:
+            List with the extracted information (or None on failure) for each file, in input order
+        """
+        max_workers = max_workers or os.cpu_count() or 1
+        max_in_flight = max_in_flight or max_workers * 2
+        
+        # The extractors only ever see immutable bytes, so threads never share a file position.
+        # Threads have no script context either, so their messages are shown from this thread
+        messages = [[] for _ in uploaded_files]
+        texts = {}
+        pending = {}
+        completed = 0
+        
+        def record(i, extract):
+            nonlocal completed
+            try:
+                texts[i] = extract()
+            except Exception as e:
+                messages[i].append(('error', f"Error processing {uploaded_files[i].name}: {str(e)}"))
+            completed += 1
+            if on_progress:
+                on_progress(completed, len(uploaded_files))
+        
+        def collect(future):
+            record(pending.pop(future), future.result)
+        
+        pdf_files = []
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for i, uploaded_file in enumerate(uploaded_files):
+                if uploaded_file.name.lower().endswith('.pdf'):
+                    pdf_files.append(i)
+                    continue
+                
+                if len(pending) >= max_in_flight:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        collect(future)
+                
+                pending[executor.submit(self._extract_text, uploaded_file.name, uploaded_file.getvalue(), messages[i])] = i
             
-            return extracted_info
+            for i in pdf_files:
+                record(i, lambda: self._extract_text(uploaded_files[i].name, uploaded_files[i].getvalue(), messages[i]))
+                # Pick up whatever the pool finished meanwhile so progress keeps moving
+                done, _ = wait(pending, timeout=0)
+                for future in done:
+                    collect(future)
             
+            for future in as_completed(list(pending)):
+                collect(future)
+        
+        # NLP runs here as a single batch, so spaCy is only ever used from one thread
+        results = self._process_texts(uploaded_files, dict(sorted(texts.items())), messages)
+        for file_messages in messages:
+            show_messages(file_messages)
+        
+        return results
+    
+    def _process_texts(self, uploaded_files, texts: Dict[int, str],
+                       messages: List[List[Message]]) -> List[Optional[Dict[str, Any]]]:
+        """Run NLP over the extracted texts, keyed by position in uploaded_files"""
+        results = [None] * len(uploaded_files)
+        
+        for i in list(texts):
+            if not texts[i] or len(texts[i].strip()) < 50:
+                messages[i].append(('error', f"Could not extract sufficient text from {uploaded_files[i].name}"))
+                del texts[i]
+        
+        if not texts:
+            return results
+        
+        try:
+            # Extract structured information using NLP
+            batch_info = self.nlp_extractor.extract_information_batch(list(texts.values()))
         except Exception as e:
-            st.error(f"Error processing {uploaded_file.name}: {str(e)}")
-            return None
+            for i in texts:
+                messages[i].append(('error', f"Error processing {uploaded_files[i].name}: {str(e)}"))
+            return results
+        
+        for (i, text), extracted_info in zip(texts.items(), batch_info):
+            # Add raw text for additional processing if needed
+            extracted_info['raw_text'] = text
+            extracted_info['file_type'] = uploaded_files[i].type
+            results[i] = extracted_info
+        
+        return results
     
-    def _extract_text(self, uploaded_file) -> str:
-        """Extract text from various file formats"""
+    def _extract_text(self, filename: str, data: bytes, messages: List[Message]) -> str:
+        """Extract text from various file formats, adding any messages for the user to messages"""
         
-        file_extension = uploaded_file.name.lower().split('.')[-1]
+        file_extension = filename.lower().split('.')[-1]
         
         try:
             if file_extension == 'pdf':
-                return self._extract_from_pdf(uploaded_file)
+                return self._extract_from_pdf(filename, data, messages)
             elif file_extension == 'docx':
-                return self._extract_from_docx(uploaded_file)
+                return self._extract_from_docx(data)
             elif file_extension == 'txt':
-                return self._extract_from_txt(uploaded_file)
+                return self._extract_from_txt(data)
             else:
                 raise ValueError(f"Unsupported file format: {file_extension}")
                 
         except Exception as e:
-            st.error(f"Error extracting text from {uploaded_file.name}: {str(e)}")
+            messages.append(('error', f"Error extracting text from {filename}: {str(e)}"))
             raise
     
-    def _extract_from_pdf(self, uploaded_file) -> str:
+    def _extract_from_pdf(self, filename: str, data: bytes, messages: List[Message]) -> str:
         """Extract text from PDF file"""
+        if PDFIUM_AVAILABLE:
+            try:
+                return self._extract_from_pdf_pdfium(data)
+            except Exception:
+                pass  # Fall back to PyPDF2 below
+        
         try:
-            pdf_reader = PyPDF2.PdfReader(io.BytesIO(uploaded_file.read()))
-            text = ""
-            
-            for page_num in range(len(pdf_reader.pages)):
-                page = pdf_reader.pages[page_num]
-                text += page.extract_text() + "\n"
-            
-            # Reset file pointer for potential reuse
-            uploaded_file.seek(0)
+            pdf_reader = PyPDF2.PdfReader(io.BytesIO(data))
+            pages = [page.extract_text() for page in pdf_reader.pages]
             
-            return text.strip()
+            return "\n".join(pages).strip()
             
         except Exception as e:
             # Try alternative approach if PyPDF2 fails
-            st.warning(f"Primary PDF extraction failed for {uploaded_file.name}, trying alternative method")
+            messages.append(('warning', f"Primary PDF extraction failed for {filename}, trying alternative method"))
             try:
-                # Reset file pointer
-                uploaded_file.seek(0)
-                # Read as binary and try to extract basic text
-                content = uploaded_file.read()
-                text = content.decode('utf-8', errors='ignore')
-                uploaded_file.seek(0)
-                return text
+                # Decode the raw bytes and hope for embedded plain text
+                return data.decode('utf-8', errors='ignore')
             except:
                 raise Exception(f"Could not extract text from PDF: {str(e)}")
     
-    def _extract_from_docx(self, uploaded_file) -> str:
+    def _extract_from_pdf_pdfium(self, data: bytes) -> str:
+        """Extract text from PDF file using the native PDFium library"""
+        with _pdfium_lock:
+            pdf = pdfium.PdfDocument(data)
+            try:
+                pages = []
+                for page in pdf:
+                    textpage = page.get_textpage()
+                    # PDFium ends lines with CRLF; normalise to match the other extractors
+                    pages.append(textpage.get_text_range().replace("\r\n", "\n"))
+                    textpage.close()
+                    page.close()
+            finally:
+                pdf.close()
+        
+        return "\n".join(pages).strip()
+    
+    def _extract_from_docx(self, data: bytes) -> str:
         """Extract text from DOCX file"""
         try:
-            doc = docx.Document(io.BytesIO(uploaded_file.read()))
-            text = ""
-            
-            for paragraph in doc.paragraphs:
-                text += paragraph.text + "\n"
-            
-            # Reset file pointer
-            uploaded_file.seek(0)
+            doc = docx.Document(io.BytesIO(data))
+            paragraphs = [paragraph.text for paragraph in doc.paragraphs]
             
-            return text.strip()
+            return "\n".join(paragraphs).strip()
             
         except Exception as e:
             raise Exception(f"Could not extract text from DOCX: {str(e)}")
     
-    def _extract_from_txt(self, uploaded_file) -> str:
+    def _extract_from_txt(self, data: bytes) -> str:
         """Extract text from TXT file"""
         try:
             # Try UTF-8 first
-            text = uploaded_file.read().decode('utf-8')
-            uploaded_file.seek(0)
-            return text.strip()
+            return data.decode('utf-8').strip()
             
         except UnicodeDecodeError:
             try:
                 # Try latin-1 if UTF-8 fails
-                uploaded_file.seek(0)
-                text = uploaded_file.read().decode('latin-1')
-                uploaded_file.seek(0)
-                return text.strip()
+                return data.decode('latin-1').strip()
             except Exception as e:
                 raise Exception(f"Could not decode text file: {str(e)}")
         except Exception as e:
@@ -147,3 +331,79 @@ class ResumeProcessor:
             return False
         
         return True
+
+
+def _as_uploaded_file(filename: str, data: bytes, file_type: str) -> io.BytesIO:
+    """Wrap raw bytes in a file-like object exposing the attributes of an upload"""
+    uploaded_file = io.BytesIO(data)
+    uploaded_file.name = filename
+    uploaded_file.type = file_type
+    return uploaded_file
+
+# Processor owned by a pool worker process, created on its first task
+_worker_processor: Optional[ResumeProcessor] = None
+
+def extract_resume_bytes(files: List[Tuple[str, bytes, str]]) -> List[Tuple[Optional[Dict[str, Any]], List[Message]]]:
+    """
+    Extract resume information from raw file bytes inside a worker
+    
+    Worker processes have no Streamlit script context, so messages are
+    returned for the main process to display.
+    
+    Args:
+        files: (filename, file contents, MIME type) for each upload in the chunk
+        
+    Returns:
+        List of (extracted information or None on failure, messages) for each file
+    """
+    global _worker_processor
+    if _worker_processor is None:
+        _worker_processor = ResumeProcessor()
+    
+    uploaded_files = [_as_uploaded_file(filename, data, file_type) for filename, data, file_type in files]
+    results, messages = _worker_processor.collect_resumes(uploaded_files)
+    return list(zip(results, messages))
+
+def extract_resume_shared(files: List[Tuple[str, str, Union[bytes, Tuple[str, int]]]]) -> List[Tuple[Optional[Dict[str, Any]], List[Message]]]:
+    """
+    Extract resume information from file bytes, some of which may be held in shared memory blocks
+    
+    Args:
+        files: (filename, MIME type, data) for each upload in the chunk, where data is either the
+            file contents or the (shared memory block name, file size) they were copied to
+        
+    Returns:
+        List of (extracted information or None on failure, messages) for each file
+    """
+    contents = []
+    for filename, file_type, data in files:
+        if isinstance(data, tuple):
+            shm_name, size = data
+            shm = shared_memory.SharedMemory(name=shm_name)
+            try:
+                data = bytes(shm.buf[:size])
+            finally:
+                # The parent process owns the block and unlinks it once the task is done
+                shm.close()
+        contents.append((filename, data, file_type))
+    
+    return extract_resume_bytes(contents)
+
+# Upload bytes every session in this process currently holds in shared memory blocks
+_shared_bytes_in_use = 0
+_shared_bytes_lock = threading.Lock()
+
+def reserve_shared_memory(size: int, budget: int) -> bool:
+    """Claim size bytes of shared memory, unless all sessions together would exceed budget"""
+    global _shared_bytes_in_use
+    with _shared_bytes_lock:
+        if _shared_bytes_in_use + size > budget:
+            return False
+        _shared_bytes_in_use += size
+        return True
+
+def release_shared_memory(size: int):
+    """Give back bytes claimed with reserve_shared_memory"""
+    global _shared_bytes_in_use
+    with _shared_bytes_lock:
+        _shared_bytes_in_use -= size
@@ -1,6 +1,82 @@
 import re
-from typing import Dict, List, Any
+import numpy as np
+from functools import lru_cache
+from typing import Dict, FrozenSet, List, Any
 import streamlit as st
+from rapidfuzz import fuzz, process
+
+# Numeric rank of each education level; unrecognised levels count as the lowest
+EDUCATION_LEVELS = {
+    "High School": 1,
+    "Certificate/Diploma": 2,
+    "Bachelor's Degree": 3,
+    "Master's Degree": 4,
+    "PhD": 5
+}
+
+# Common technology families: a family name and the skills related to it
+TECH_FAMILIES = {
+    'javascript': ['js', 'node.js', 'nodejs', 'react', 'angular', 'vue'],
+    'python': ['django', 'flask', 'pandas', 'numpy', 'tensorflow'],
+    'java': ['spring', 'hibernate', 'maven', 'gradle'],
+    'database': ['sql', 'mysql', 'postgresql', 'oracle', 'mongodb'],
+    'cloud': ['aws', 'azure', 'gcp', 'docker', 'kubernetes']
+}
+
+# Reverse lookup: related skill -> families it belongs to
+_SKILL_FAMILIES = {}
+for _family, _related_skills in TECH_FAMILIES.items():
+    for _skill in _related_skills:
+        _SKILL_FAMILIES.setdefault(_skill, set()).add(_family)
+
+@lru_cache(maxsize=8192)
+def _skills_similarity_cached(skill1_lower: str, skill2_lower: str) -> float:
+    """Similarity between two lowercased skills; symmetric, so callers pass the pair sorted"""
+    
+    # Exact match
+    if skill1_lower == skill2_lower:
+        return 1.0
+    
+    # Check if one is contained in the other
+    if skill1_lower in skill2_lower or skill2_lower in skill1_lower:
+        return 0.8
+    
+    # Check for common technology families
+    families1 = _SKILL_FAMILIES.get(skill1_lower, set())
+    families2 = _SKILL_FAMILIES.get(skill2_lower, set())
+    if skill1_lower in families2 or skill2_lower in families1 or families1 & families2:
+        return 0.7
+    
+    # Edit-distance similarity of the two names
+    return fuzz.ratio(skill1_lower, skill2_lower) / 100.0
+
+def _similarity_matrix(skills: List[str], required_skills: List[str]) -> np.ndarray:
+    """
+    Which skills are similar enough (> 0.7) to each required skill
+    
+    Args:
+        skills: Lowercased skills
+        required_skills: Lowercased required skills
+        
+    Returns:
+        Boolean array of shape (len(skills), len(required_skills))
+    """
+    if not skills or not required_skills:
+        return np.zeros((len(skills), len(required_skills)), dtype=bool)
+    
+    # Edit-distance ratios for every pair in one multithreaded call
+    similar = process.cdist(skills, required_skills, scorer=fuzz.ratio, dtype=np.float64, workers=-1) / 100.0 > 0.7
+    
+    # Containment and technology families take precedence over the ratio, as in _skills_similarity_cached
+    for i, skill in enumerate(skills):
+        families = _SKILL_FAMILIES.get(skill, set())
+        for j, req_skill in enumerate(required_skills):
+            if skill in req_skill or req_skill in skill:
+                similar[i, j] = True
+            elif skill in _SKILL_FAMILIES.get(req_skill, ()) or req_skill in families or families & _SKILL_FAMILIES.get(req_skill, set()):
+                similar[i, j] = False
+    
+    return similar
 
 class ScoringEngine:
     """Scores resumes against job requirements using various algorithms"""
@@ -60,13 +136,14 @@ class ScoringEngine:
             return 80.0  # Default score if no requirements specified
         
         # Calculate exact matches
-        exact_matches = len([skill for skill in required_skills if skill in resume_skills])
+        resume_set = set(resume_skills)
+        exact_matches = sum(1 for skill in required_skills if skill in resume_set)
         exact_match_score = (exact_matches / len(required_skills)) * 100
         
         # Calculate fuzzy matches for similar skills
         fuzzy_matches = 0
         for req_skill in required_skills:
-            if req_skill not in resume_skills:
+            if req_skill not in resume_set:
                 for resume_skill in resume_skills:
                     if self._skills_similarity(req_skill, resume_skill) > 0.7:
                         fuzzy_matches += 0.8  # Partial credit for similar skills
@@ -104,19 +181,11 @@ class ScoringEngine:
     def _score_education(self, resume_data: Dict[str, Any], job_requirements: Dict[str, Any]) -> float:
         """Score education level"""
         
-        education_levels = {
-            "High School": 1,
-            "Certificate/Diploma": 2,
-            "Bachelor's Degree": 3,
-            "Master's Degree": 4,
-            "PhD": 5
-        }
-        
         resume_education = resume_data.get('education', 'Not specified')
         required_education = job_requirements.get('education_level', 'High School')
         
-        resume_level = education_levels.get(resume_education, 1)
-        required_level = education_levels.get(required_education, 1)
+        resume_level = EDUCATION_LEVELS.get(resume_education, 1)
+        required_level = EDUCATION_LEVELS.get(required_education, 1)
         
         if resume_level >= required_level:
             base_score = 100
@@ -131,47 +200,17 @@ class ScoringEngine:
     def _skills_similarity(self, skill1: str, skill2: str) -> float:
         """Calculate similarity between two skills"""
         
-        # Simple similarity based on common substrings
-        skill1_lower = skill1.lower()
-        skill2_lower = skill2.lower()
-        
-        # Exact match
-        if skill1_lower == skill2_lower:
-            return 1.0
-        
-        # Check if one is contained in the other
-        if skill1_lower in skill2_lower or skill2_lower in skill1_lower:
-            return 0.8
-        
-        # Check for common technology families
-        tech_families = {
-            'javascript': ['js', 'node.js', 'nodejs', 'react', 'angular', 'vue'],
-            'python': ['django', 'flask', 'pandas', 'numpy', 'tensorflow'],
-            'java': ['spring', 'hibernate', 'maven', 'gradle'],
-            'database': ['sql', 'mysql', 'postgresql', 'oracle', 'mongodb'],
-            'cloud': ['aws', 'azure', 'gcp', 'docker', 'kubernetes']
-        }
-        
-        for family, related_skills in tech_families.items():
-            if ((skill1_lower == family and skill2_lower in related_skills) or
-                (skill2_lower == family and skill1_lower in related_skills) or
-                (skill1_lower in related_skills and skill2_lower in related_skills)):
-                return 0.7
-        
-        # Basic string similarity using common characters
-        common_chars = set(skill1_lower) & set(skill2_lower)
-        total_chars = set(skill1_lower) | set(skill2_lower)
-        
-        if len(total_chars) > 0:
-            return len(common_chars) / len(total_chars)
-        
-        return 0.0
+        # Results are cached per skill pair, which repeats across every resume in a batch
+        skill1_lower, skill2_lower = sorted((skill1.lower(), skill2.lower()))
+        return _skills_similarity_cached(skill1_lower, skill2_lower)
     
     def _analyze_skills(self, resume_data: Dict[str, Any], job_requirements: Dict[str, Any]) -> Dict[str, List[str]]:
         """Analyze skills matching in detail"""
         
         resume_skills = [skill.lower() for skill in resume_data.get('skills', [])]
         required_skills = [skill.lower() for skill in job_requirements.get('required_skills', [])]
+        resume_set = set(resume_skills)
+        required_set = set(required_skills)
         
         matched_skills = []
         missing_skills = []
@@ -179,7 +218,7 @@ class ScoringEngine:
         
         # Find matched skills
         for req_skill in required_skills:
-            if req_skill in resume_skills:
+            if req_skill in resume_set:
                 matched_skills.append(req_skill.title())
             else:
                 # Check for similar skills
@@ -195,7 +234,7 @@ class ScoringEngine:
         
         # Find additional skills not in requirements
         for resume_skill in resume_skills:
-            if resume_skill not in required_skills:
+            if resume_skill not in required_set:
                 is_additional = True
                 for req_skill in required_skills:
                     if self._skills_similarity(resume_skill, req_skill) > 0.7:
@@ -211,6 +250,39 @@ class ScoringEngine:
             'additional': additional_skills[:20]  # Limit additional skills
         }
     
+    def _analyze_skills_indexed(self, resume_skills: List[str], required_skills: List[str],
+                                required_set: FrozenSet[str], vocab: Dict[str, int],
+                                similar: np.ndarray, similar_to_any: np.ndarray) -> Dict[str, List[str]]:
+        """Equivalent of _analyze_skills using lookups precomputed once per batch"""
+        
+        resume_set = set(resume_skills)
+        matched_skills = []
+        missing_skills = []
+        additional_skills = []
+        
+        # Find matched skills, or the first similar one
+        for j, req_skill in enumerate(required_skills):
+            if req_skill in resume_set:
+                matched_skills.append(req_skill.title())
+                continue
+            
+            similar_skill = next((skill for skill in resume_skills if similar[vocab[skill], j]), None)
+            if similar_skill is not None:
+                matched_skills.append(f"{similar_skill.title()} (similar to {req_skill.title()})")
+            else:
+                missing_skills.append(req_skill.title())
+        
+        # Find additional skills not in requirements
+        for resume_skill in resume_skills:
+            if resume_skill not in required_set and not similar_to_any[vocab[resume_skill]]:
+                additional_skills.append(resume_skill.title())
+        
+        return {
+            'matched': matched_skills,
+            'missing': missing_skills,
+            'additional': additional_skills[:20]  # Limit additional skills
+        }
+    
     def _generate_recommendation(self, total_score: float) -> str:
         """Generate hiring recommendation based on score"""
         
@@ -239,20 +311,139 @@ class ScoringEngine:
             }
     
     def batch_score_resumes(self, resumes: List[Dict[str, Any]], job_requirements: Dict[str, Any]) -> List[Dict[str, Any]]:
-        """Score multiple resumes efficiently"""
+        """
+        Score multiple resumes efficiently
         
-        scored_resumes = []
+        Component scores are computed for the whole batch at once with NumPy,
+        giving the same results as calling score_resume on each resume.
+        
+        Args:
+            resumes: Extracted resume information for each candidate
+            job_requirements: Job requirements and criteria
+            
+        Returns:
+            Resumes merged with their scores, sorted by total score (descending)
+        """
+        
+        # Start each batch with an empty similarity cache to bound its memory
+        _skills_similarity_cached.cache_clear()
         
+        required_skills = [skill.lower() for skill in job_requirements.get('required_skills', [])]
+        required_experience = float(job_requirements.get('experience_years', 0))
+        required_level = EDUCATION_LEVELS.get(job_requirements.get('education_level', 'High School'), 1)
+        
+        # Gather each resume's inputs, skipping malformed records as score_resume would
+        valid_resumes, resume_skills, experience, education = [], [], [], []
         for resume in resumes:
             try:
-                score_data = self.score_resume(resume, job_requirements)
-                scored_resume = {**resume, **score_data}
-                scored_resumes.append(scored_resume)
+                skills = [skill.lower() for skill in resume.get('skills', [])]
+                years = float(resume.get('experience_years', 0))
+                level = EDUCATION_LEVELS.get(resume.get('education', 'Not specified'), 1)
             except Exception as e:
                 st.error(f"Error scoring resume {resume.get('filename', 'Unknown')}: {str(e)}")
                 continue
+            valid_resumes.append(resume)
+            resume_skills.append(skills)
+            experience.append(years)
+            education.append(level)
+        
+        if not valid_resumes:
+            return []
+        
+        # Vocabulary of every skill in the batch, and which entries are similar to each requirement
+        vocab = {}
+        for skills in resume_skills:
+            for skill in skills:
+                vocab.setdefault(skill, len(vocab))
+        for skill in required_skills:
+            vocab.setdefault(skill, len(vocab))
+        similar = _similarity_matrix(list(vocab), required_skills)
+        # Requirement lookups shared by every resume's skill analysis
+        required_set = frozenset(required_skills)
+        similar_to_any = similar.any(axis=1)
+        
+        skills_scores = self._batch_score_skills(resume_skills, required_skills, vocab, similar)
+        experience = np.array(experience, dtype=np.float64)
+        education = np.array(education, dtype=np.float64)
+        
+        # Experience: full score once the requirement is met, proportional below it
+        if required_experience == 0:
+            experience_scores = np.full(len(valid_resumes), 100.0)
+        else:
+            experience_scores = np.where(
+                experience >= required_experience,
+                100.0,
+                np.maximum(experience / required_experience * 80, 10)
+            )
+        
+        # Education: full score at or above the required level, with a 30% floor below it
+        education_scores = np.where(
+            education >= required_level,
+            100.0,
+            np.maximum(education / required_level * 70, 30)
+        )
+        
+        total_scores = (
+            skills_scores * self.weights['skills'] +
+            experience_scores * self.weights['experience'] +
+            education_scores * self.weights['education']
+        )
+        
+        scored_resumes = []
+        columns = zip(
+            valid_resumes, resume_skills, total_scores.tolist(), skills_scores.tolist(),
+            experience_scores.tolist(), education_scores.tolist()
+        )
+        for resume, skills, total_score, skills_score, experience_score, education_score in columns:
+            skill_analysis = self._analyze_skills_indexed(
+                skills, required_skills, required_set, vocab, similar, similar_to_any
+            )
+            scored_resumes.append({
+                **resume,
+                'total_score': round(total_score, 1),
+                'skills_score': round(skills_score, 1),
+                'experience_score': round(experience_score, 1),
+                'education_score': round(education_score, 1),
+                'matched_skills': skill_analysis['matched'],
+                'missing_skills': skill_analysis['missing'],
+                'additional_skills': skill_analysis['additional'],
+                'recommendation': self._generate_recommendation(total_score)
+            })
         
         # Sort by total score (descending)
         scored_resumes.sort(key=lambda x: x.get('total_score', 0), reverse=True)
         
         return scored_resumes
+    
+    def _batch_score_skills(self, resume_skills: List[List[str]], required_skills: List[str],
+                            vocab: Dict[str, int], similar: np.ndarray) -> np.ndarray:
+        """Vectorized equivalent of _score_skills for lowercased skill lists"""
+        
+        skill_counts = np.array([len(skills) for skills in resume_skills])
+        if not required_skills:
+            return np.full(len(resume_skills), 80.0)  # Default score if no requirements specified
+        
+        # Membership matrix over the batch vocabulary
+        rows = [row for row, skills in enumerate(resume_skills) for _ in skills]
+        cols = [vocab[skill] for skills in resume_skills for skill in skills]
+        required_cols = [vocab[skill] for skill in required_skills]
+        
+        membership = np.zeros((len(resume_skills), len(vocab)), dtype=bool)
+        membership[rows, cols] = True
+        
+        # Calculate exact matches, then partial credit for similar skills
+        exact = membership[:, required_cols]
+        fuzzy = ~exact & (membership @ similar)
+        
+        # Partial credit summed one match at a time, as in _score_skills
+        partial_credit = np.cumsum([0.0] + [0.8] * len(required_skills))
+        exact_match_score = (exact.sum(axis=1) / len(required_skills)) * 100
+        fuzzy_match_score = (partial_credit[fuzzy.sum(axis=1)] / len(required_skills)) * 100
+        
+        # Combine scores (prioritize exact matches)
+        combined_score = np.minimum(exact_match_score + fuzzy_match_score * 0.5, 100)
+        
+        # Bonus for having many relevant skills
+        skill_bonus = np.where(skill_counts > 10, np.minimum(skill_counts * 2, 20), 0)
+        
+        return np.minimum(combined_score + skill_bonus, 100)
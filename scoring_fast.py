@@ -0,0 +1,68 @@
+import numpy as np
+from typing import Any, Dict, Iterable, List, Tuple
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+# Number of set bits in every possible byte value
+_POPCOUNT_TABLE = np.array([bin(i).count('1') for i in range(256)], dtype=np.uint8)
+
+def encode_skill_masks(resumes: List[Dict[str, Any]], required_skills: Iterable[str]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Encode candidate skills and required skills as packed bitmasks
+
+    Args:
+        resumes: Resume records with a 'skills' list
+        required_skills: Lowercased required skills
+
+    Returns:
+        Tuple of (per-resume masks of shape (N, ceil(V/8)), requirement mask of shape (ceil(V/8),))
+    """
+
+    # Map every lowercased skill in the pool to a bit position
+    vocab = {}
+    rows, cols = [], []
+    for row, resume in enumerate(resumes):
+        for skill in resume.get('skills', []):
+            rows.append(row)
+            cols.append(vocab.setdefault(skill.lower(), len(vocab)))
+
+    membership = np.zeros((len(resumes), max(len(vocab), 1)), dtype=bool)
+    membership[rows, cols] = True
+    required = np.zeros(membership.shape[1], dtype=bool)
+    required[[vocab[skill] for skill in set(required_skills) if skill in vocab]] = True
+
+    return np.packbits(membership, axis=1), np.packbits(required)
+
+def _count_matches_numpy(resume_masks: np.ndarray, required_mask: np.ndarray) -> np.ndarray:
+    """Popcount of each masked row using a byte lookup table"""
+    return _POPCOUNT_TABLE[resume_masks & required_mask].sum(axis=1, dtype=np.int64)
+
+if NUMBA_AVAILABLE:
+    # Single-threaded on purpose: Streamlit calls this from concurrent script
+    # threads, which numba's parallel threading layers do not support
+    @njit(cache=True)
+    def _count_matches_numba(resume_masks, required_mask, popcount_table):
+        """Popcount of each masked row"""
+        n_rows, n_bytes = resume_masks.shape
+        counts = np.zeros(n_rows, dtype=np.int64)
+        for row in range(n_rows):
+            total = 0
+            for col in range(n_bytes):
+                total += popcount_table[resume_masks[row, col] & required_mask[col]]
+            counts[row] = total
+        return counts
+
+def count_matches(resume_masks: np.ndarray, required_mask: np.ndarray) -> np.ndarray:
+    """Count the bits each resume mask shares with the requirement mask"""
+    if NUMBA_AVAILABLE:
+        return _count_matches_numba(resume_masks, required_mask, _POPCOUNT_TABLE)
+    return _count_matches_numpy(resume_masks, required_mask)
+
+def count_skill_matches(resumes: List[Dict[str, Any]], required_skills: Iterable[str]) -> np.ndarray:
+    """Count each candidate's matched required skills"""
+    resume_masks, required_mask = encode_skill_masks(resumes, required_skills)
+    return count_matches(resume_masks, required_mask)
@@ -1,94 +1,211 @@
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pacsv
 import streamlit as st
 from datetime import datetime
-from typing import Dict, List, Any
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Dict, FrozenSet, Iterable, List, Any, Mapping, Optional, TextIO, Tuple, Union
 import io
+import re
 
-def export_to_csv(resume_data: List[Dict[str, Any]]) -> str:
-    """Export resume screening results to CSV format"""
-    
-    # Create DataFrame
-    df = pd.DataFrame(resume_data)
-    
-    # Select and rename columns for export
-    export_columns = {
-        'filename': 'Resume File',
-        'name': 'Candidate Name',
-        'email': 'Email',
-        'phone': 'Phone',
-        'total_score': 'Total Score',
-        'skills_score': 'Skills Score',
-        'experience_score': 'Experience Score',
-        'education_score': 'Education Score',
-        'experience_years': 'Years of Experience',
-        'education': 'Education Level',
-        'skills': 'Skills',
-        'recommendation': 'Recommendation',
-        'matched_skills': 'Matched Skills',
-        'missing_skills': 'Missing Skills',
-        'processed_at': 'Processed Date'
-    }
+# Durations in resume text, tried in this order by parse_years_from_text
+_YEARS_RE = re.compile(r'(\d+\.?\d*)\s*(?:years?|yrs?)')
+_MONTHS_RE = re.compile(r'(\d+\.?\d*)\s*(?:months?|mos?)')
+# Runs of whitespace, collapsed to single spaces for display
+_WS_RE = re.compile(r'\s+')
+
+# Common skill name normalizations, keyed by lowercased name
+_SKILL_NORMALIZATIONS = MappingProxyType({
+    'js': 'javascript',
+    'nodejs': 'node.js',
+    'reactjs': 'react',
+    'vuejs': 'vue',
+    'c++': 'cpp',
+    'c#': 'csharp',
+    '.net': 'dotnet',
+    'ai': 'artificial intelligence',
+    'ml': 'machine learning',
+})
+
+# Contact information patterns, compiled once at import
+_CONTACT_INFO_PATTERNS = MappingProxyType({
+    'email': re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}\b'),
+    'phone': re.compile(r'(\+\d{1,3}[-.\s]?)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}'),
+    'linkedin': re.compile(r'linkedin\.com/in/[\w-]+'),
+    'github': re.compile(r'github\.com/[\w-]+'),
+})
+
+# Lower score bounds of the color buckets, and the color for each bucket from lowest up
+_SCORE_COLOR_EDGES = np.array([55, 70, 85])
+_SCORE_COLORS = np.array(["#FF4444", "#FF8800", "#ffbb33", "#00C851"])
+
+# File extensions ResumeProcessor can extract text from
+ALLOWED_RESUME_EXTENSIONS = frozenset({'pdf', 'docx', 'txt'})
+
+# Job requirements shown before the user sets their own
+_SAMPLE_JOB_REQUIREMENTS = MappingProxyType({
+    'job_title': 'Software Engineer',
+    'required_skills': (
+        'python', 'javascript', 'sql', 'git', 'react', 'django', 'flask',
+        'html', 'css', 'rest api', 'json', 'agile', 'problem solving',
+        'communication', 'teamwork', 'linux', 'aws', 'docker'
+    ),
+    'experience_years': 3,
+    'education_level': "Bachelor's Degree"
+})
+
+# Resume fields exported to CSV, in column order, with their CSV headers
+_EXPORT_COLUMNS = (
+    ('filename', 'Resume File'),
+    ('name', 'Candidate Name'),
+    ('email', 'Email'),
+    ('phone', 'Phone'),
+    ('total_score', 'Total Score'),
+    ('skills_score', 'Skills Score'),
+    ('experience_score', 'Experience Score'),
+    ('education_score', 'Education Score'),
+    ('experience_years', 'Years of Experience'),
+    ('education', 'Education Level'),
+    ('skills', 'Skills'),
+    ('recommendation', 'Recommendation'),
+    ('matched_skills', 'Matched Skills'),
+    ('missing_skills', 'Missing Skills'),
+    ('processed_at', 'Processed Date'),
+)
+
+_EXPORT_SOURCE_COLUMNS = [source for source, _ in _EXPORT_COLUMNS]
+
+# HTML for a score badge, filled with the badge color and the score
+_SCORE_BADGE_TEMPLATE = '<span style="background-color: %s; color: white; padding: 2px 8px; border-radius: 12px; font-weight: bold;">%.1f</span>'
+
+@lru_cache(maxsize=32)
+def _resolve_export_columns(columns: FrozenSet[str]) -> Tuple[Tuple[str, ...], Tuple[str, ...]]:
+    """Export columns present in a frame, as (source names, CSV headers) in export order"""
+    available = [(source, header) for source, header in _EXPORT_COLUMNS if source in columns]
+    return tuple(source for source, _ in available), tuple(header for _, header in available)
+
+def export_to_csv(resume_data: Union[List[Dict[str, Any]], pd.DataFrame],
+                  out: Optional[TextIO] = None, chunksize: int = 10_000) -> Optional[str]:
+    """
+    Export resume screening results (records or an existing DataFrame) to CSV format
+    
+    The CSV is written by pyarrow: text fields are always quoted, and whole-number
+    floats are written without a trailing ".0".
+    
+    Args:
+        resume_data: Scored resume records, or a DataFrame of them
+        out: Text stream to write the CSV to; when omitted the CSV is returned as a string
+        chunksize: Rows formatted per write, bounding the memory used for large exports
+        
+    Returns:
+        The CSV text, or None when it was written to out
+    """
+    
+    # Create DataFrame, unless the caller already has one. Records are read straight into
+    # the export columns, so pandas skips inferring a schema from every record's keys
+    if isinstance(resume_data, pd.DataFrame):
+        df = resume_data
+    else:
+        df = pd.DataFrame.from_records(resume_data, columns=_EXPORT_SOURCE_COLUMNS)
     
-    # Select available columns
-    available_columns = {k: v for k, v in export_columns.items() if k in df.columns}
-    export_df = df[list(available_columns.keys())].copy()
-    export_df.rename(columns=available_columns, inplace=True)
+    # Select and rename the available export columns
+    source_columns, renamed_columns = _resolve_export_columns(frozenset(df.columns))
+    # reindex returns a new frame, so the columns can be replaced below without a copy
+    # (and without pandas' SettingWithCopyWarning on a plain column selection); the
+    # headers are then swapped in positionally rather than through a rename mapping
+    export_df = df.reindex(columns=list(source_columns)).set_axis(list(renamed_columns), axis=1)
     
-    # Convert lists to strings for CSV export
+    # Convert lists to strings for CSV export; to_csv stringifies every other cell itself
     for col in export_df.columns:
-        if export_df[col].dtype == 'object':
-            export_df[col] = export_df[col].apply(
-                lambda x: ', '.join(x) if isinstance(x, list) else str(x)
-            )
+        if export_df[col].dtype != 'object':
+            continue
+        first_valid = export_df[col].first_valid_index()
+        if first_valid is not None and isinstance(export_df[col].at[first_valid], list):
+            export_df[col] = export_df[col].map(lambda x: ', '.join(x) if isinstance(x, list) else x)
+    
+    # Stream the CSV in chunks, either to the caller's stream or to an in-memory buffer
+    if out is not None:
+        _write_csv_arrow(export_df, out, chunksize)
+        return None
+    
+    buffer = io.StringIO()
+    _write_csv_arrow(export_df, buffer, chunksize)
+    return buffer.getvalue()
+
+def _write_csv_arrow(export_df: pd.DataFrame, out: TextIO, chunksize: int):
+    """Write a frame as CSV text with Arrow's multithreaded writer, chunksize rows at a time"""
+    try:
+        table = pa.Table.from_pandas(export_df, preserve_index=False)
+    except (pa.ArrowException, TypeError, ValueError):
+        # Arrow can't type object columns holding mixed values, so write those as text
+        object_columns = export_df.select_dtypes(include='object').columns
+        table = pa.Table.from_pandas(export_df.astype({col: 'string' for col in object_columns}), preserve_index=False)
     
-    # Convert to CSV string
-    return export_df.to_csv(index=False)
+    # The writer only takes binary sinks; pass each chunk's rows on to out as they're written
+    sink = io.BytesIO()
+    writer = pacsv.CSVWriter(sink, table.schema)
+    try:
+        for batch in table.to_batches(max_chunksize=chunksize):
+            writer.write_batch(batch)
+            out.write(sink.getvalue().decode('utf-8'))
+            sink.seek(0)
+            sink.truncate()
+    finally:
+        writer.close()
+    out.write(sink.getvalue().decode('utf-8'))
 
 def create_sample_job_requirements() -> Dict[str, Any]:
     """Create sample job requirements for demonstration"""
-    return {
-        'job_title': 'Software Engineer',
-        'required_skills': [
-            'python', 'javascript', 'sql', 'git', 'react', 'django', 'flask',
-            'html', 'css', 'rest api', 'json', 'agile', 'problem solving',
-            'communication', 'teamwork', 'linux', 'aws', 'docker'
-        ],
-        'experience_years': 3,
-        'education_level': "Bachelor's Degree"
-    }
+    # A shallow copy is enough: the skills are a tuple and every other value is immutable
+    return dict(_SAMPLE_JOB_REQUIREMENTS)
 
 def format_skill_list(skills: List[str], max_display: int = 5) -> str:
     """Format skill list for display"""
     if not skills:
         return "None"
     
-    if len(skills) <= max_display:
+    hidden = len(skills) - max_display
+    if hidden <= 0:
         return ", ".join(skills)
-    else:
-        return ", ".join(skills[:max_display]) + f" (+ {len(skills) - max_display} more)"
+    
+    # Format the shown skills and the remainder count in one step
+    return f"{', '.join(skills[:max_display])} (+ {hidden} more)"
 
-def calculate_match_percentage(matched_skills: List[str], required_skills: List[str]) -> float:
-    """Calculate skill match percentage"""
-    if not required_skills:
+def calculate_match_percentage(matched_skills: Iterable[str], required_skills: Iterable[str]) -> float:
+    """Calculate skill match percentage, counting each distinct required skill once"""
+    required = required_skills if isinstance(required_skills, (set, frozenset)) else set(required_skills)
+    if not required:
         return 100.0
     
-    return (len(matched_skills) / len(required_skills)) * 100
+    matched = matched_skills if isinstance(matched_skills, (set, frozenset)) else set(matched_skills)
+    return 100.0 * len(matched & required) / len(required)
+
+@lru_cache(maxsize=32)
+def _normalized_extensions(allowed_types: Tuple[str, ...]) -> FrozenSet[str]:
+    """Normalise allowed extensions to lowercase names without a leading dot"""
+    return frozenset(ext.lower().lstrip('.') for ext in allowed_types)
 
-def validate_file_type(filename: str, allowed_types: List[str]) -> bool:
-    """Validate if file type is allowed"""
+def validate_file_type(filename: str, allowed_types: Optional[Iterable[str]] = None) -> bool:
+    """Validate if file type is allowed (by default, the formats resumes can be read from)"""
     if not filename:
         return False
     
-    file_extension = filename.lower().split('.')[-1]
-    return file_extension in [ext.lower() for ext in allowed_types]
+    allowed = ALLOWED_RESUME_EXTENSIONS if allowed_types is None else _normalized_extensions(tuple(allowed_types))
+    return filename.rpartition('.')[2].lower() in allowed
 
 def clean_text_for_display(text: str, max_length: int = 100) -> str:
     """Clean and truncate text for display"""
     if not text:
         return ""
     
-    # Remove extra whitespace
-    cleaned = ' '.join(text.split())
+    # Only the start of a long text is shown, so normalize a window of it first;
+    # the whole text is needed only when whitespace collapses the window too far
+    window = max_length * 4
+    cleaned = _WS_RE.sub(' ', text[:window]).strip()
+    if len(text) > window and len(cleaned) <= max_length:
+        cleaned = _WS_RE.sub(' ', text).strip()
     
     # Truncate if too long
     if len(cleaned) > max_length:
@@ -96,24 +213,31 @@ def clean_text_for_display(text: str, max_length: int = 100) -> str:
     
     return cleaned
 
+def _column(resumes: List[Dict[str, Any]], key: str) -> np.ndarray:
+    """Values of one numeric field across resumes, skipping those without it"""
+    return np.fromiter((r[key] for r in resumes if key in r), dtype=np.float64)
+
 def generate_summary_stats(resumes: List[Dict[str, Any]]) -> Dict[str, Any]:
     """Generate summary statistics for processed resumes"""
     if not resumes:
         return {}
     
-    df = pd.DataFrame(resumes)
+    # Reduce the two numeric fields directly rather than building a DataFrame of every field
+    scores = _column(resumes, 'total_score')
+    experience = _column(resumes, 'experience_years')
     
     stats = {
-        'total_candidates': len(df),
-        'average_score': df['total_score'].mean() if 'total_score' in df.columns else 0,
-        'highest_score': df['total_score'].max() if 'total_score' in df.columns else 0,
-        'lowest_score': df['total_score'].min() if 'total_score' in df.columns else 0,
-        'qualified_candidates': len(df[df['total_score'] >= 70]) if 'total_score' in df.columns else 0,
-        'average_experience': df['experience_years'].mean() if 'experience_years' in df.columns else 0,
+        'total_candidates': len(resumes),
+        'average_score': scores.mean() if scores.size else 0,
+        'highest_score': scores.max() if scores.size else 0,
+        'lowest_score': scores.min() if scores.size else 0,
+        'qualified_candidates': int((scores >= 70).sum()),
+        'average_experience': experience.mean() if experience.size else 0,
     }
     
     return stats
 
+@lru_cache(maxsize=128)
 def get_color_for_score(score: float) -> str:
     """Get color code for score visualization"""
     if score >= 85:
@@ -125,61 +249,44 @@ def get_color_for_score(score: float) -> str:
     else:
         return "#FF4444"  # Red
 
+@lru_cache(maxsize=1024)
 def create_score_badge(score: float) -> str:
     """Create HTML badge for score display"""
-    color = get_color_for_score(score)
-    return f'<span style="background-color: {color}; color: white; padding: 2px 8px; border-radius: 12px; font-weight: bold;">{score:.1f}</span>'
+    # Cached on the score itself: rounding first could move it across a color boundary
+    return _SCORE_BADGE_TEMPLATE % (get_color_for_score(score), score)
+
+def get_colors_vectorized(scores: np.ndarray) -> np.ndarray:
+    """Color code for each score in an array, matching get_color_for_score"""
+    scores = np.asarray(scores, dtype=np.float64)
+    buckets = np.searchsorted(_SCORE_COLOR_EDGES, scores, side='right')
+    # NaN fails every threshold in get_color_for_score, so it falls in the lowest bucket
+    buckets[np.isnan(scores)] = 0
+    return _SCORE_COLORS[buckets]
 
 def parse_years_from_text(text: str) -> float:
     """Parse years from various text formats"""
-    import re
+    text_lower = text.lower()
     
-    # Common patterns for years
-    patterns = [
-        r'(\d+\.?\d*)\s*(?:years?|yrs?)',
-        r'(\d+\.?\d*)\s*(?:months?|mos?)',  # Convert months to years
-    ]
+    match = _YEARS_RE.search(text_lower)
+    if match:
+        return float(match.group(1))
     
-    for pattern in patterns:
-        matches = re.findall(pattern, text.lower())
-        if matches:
-            try:
-                value = float(matches[0])
-                # If pattern matched months, convert to years
-                if 'month' in pattern or 'mos' in pattern:
-                    value = value / 12
-                return value
-            except ValueError:
-                continue
+    # Fall back to a duration in months, converted to years
+    match = _MONTHS_RE.search(text_lower)
+    if match:
+        return float(match.group(1)) / 12
     
     return 0.0
 
+@lru_cache(maxsize=4096)
 def normalize_skill_name(skill: str) -> str:
     """Normalize skill names for better matching"""
-    # Common skill name normalizations
-    normalizations = {
-        'js': 'javascript',
-        'nodejs': 'node.js',
-        'reactjs': 'react',
-        'vuejs': 'vue',
-        'c++': 'cpp',
-        'c#': 'csharp',
-        '.net': 'dotnet',
-        'ai': 'artificial intelligence',
-        'ml': 'machine learning',
-    }
-    
-    skill_lower = skill.lower().strip()
-    return normalizations.get(skill_lower, skill_lower)
+    skill_lower = skill.strip().lower()
+    return _SKILL_NORMALIZATIONS.get(skill_lower, skill_lower)
 
-def extract_contact_info_patterns():
-    """Return regex patterns for extracting contact information"""
-    return {
-        'email': r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b',
-        'phone': r'(\+\d{1,3}[-.\s]?)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}',
-        'linkedin': r'linkedin\.com/in/[\w-]+',
-        'github': r'github\.com/[\w-]+',
-    }
+def extract_contact_info_patterns() -> Mapping[str, re.Pattern]:
+    """Return compiled regex patterns for extracting contact information"""
+    return _CONTACT_INFO_PATTERNS
 
 @st.cache_data
 def load_common_skills():
@@ -209,3 +316,8 @@ def load_common_skills():
         'Agile', 'Scrum', 'JIRA', 'Linux', 'Windows', 'macOS', 'API', 'REST',
         'GraphQL', 'Microservices', 'JSON', 'XML'
     ]
+
+@st.cache_resource
+def load_common_skills_set() -> FrozenSet[str]:
+    """Normalized common skills, for membership tests against normalize_skill_name output"""
+    return frozenset(normalize_skill_name(skill) for skill in load_common_skills())